@@ -0,0 +1,30 @@
+"""Add composite indexes for listing, usage and verification lookups."""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0003_add_lookup_indexes"
+down_revision = "0002_add_subscription_plan"
+branch_labels = None
+depends_on = None
+
+_INDEXES = (
+    ("ix_proofs_user_created", "proofs", ["user_id", "created_at"]),
+    ("ix_verifications_proof_id", "verifications", ["proof_id"]),
+    ("ix_usage_logs_user_created", "usage_logs", ["user_id", "created_at"]),
+    ("ix_anchor_batches_status_created", "anchor_batches", ["status", "created_at"]),
+)
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction on PostgreSQL.
+    with op.get_context().autocommit_block():
+        for name, table, columns in _INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
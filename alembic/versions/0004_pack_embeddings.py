@@ -0,0 +1,71 @@
+"""Store embeddings as packed float32 bytes instead of JSON arrays."""
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision = "0004_pack_embeddings"
+down_revision = "0003_add_lookup_indexes"
+branch_labels = None
+depends_on = None
+
+_VECTOR_DTYPE = np.dtype("<f4")
+_JSON_TYPE = JSONB().with_variant(sa.JSON(), "sqlite")
+
+# (table, key column, vector column, nullable)
+_COLUMNS = (
+    ("proofs", "id", "text_embedding", True),
+    ("proofs", "id", "image_embedding", True),
+    ("similarity_index", "id", "vector", False),
+)
+
+
+def _is_packed(table: str, column: str) -> bool:
+    # 0001 builds the schema from the current models, so fresh databases
+    # already have binary columns.
+    for info in sa.inspect(op.get_bind()).get_columns(table):
+        if info["name"] == column:
+            return isinstance(info["type"], sa.LargeBinary)
+    return False
+
+
+def _rewrite(table: str, key: str, column: str, nullable: bool, source_type, target_type, convert) -> None:
+    """Copy ``column`` into a staging column of ``target_type`` and swap them."""
+    staging = f"{column}_staging"
+    op.add_column(table, sa.Column(staging, target_type, nullable=True))
+    bind = op.get_bind()
+    source = sa.table(table, sa.column(key), sa.column(column, source_type))
+    target = sa.table(table, sa.column(key), sa.column(staging, target_type))
+    rows = bind.execute(sa.select(source.c[key], source.c[column]).where(source.c[column].isnot(None))).all()
+    for row_key, value in rows:
+        bind.execute(target.update().where(target.c[key] == row_key).values({staging: convert(value)}))
+    with op.batch_alter_table(table) as batch:
+        batch.drop_column(column)
+        batch.alter_column(staging, new_column_name=column, nullable=nullable, existing_type=target_type)
+
+
+def _pack(value) -> bytes:
+    if isinstance(value, str):
+        value = json.loads(value)
+    return np.asarray(value, dtype=_VECTOR_DTYPE).tobytes()
+
+
+def _unpack(value) -> list[float]:
+    return np.frombuffer(bytes(value), dtype=_VECTOR_DTYPE).tolist()
+
+
+def upgrade() -> None:
+    for table, key, column, nullable in _COLUMNS:
+        if not _is_packed(table, column):
+            _rewrite(table, key, column, nullable, _JSON_TYPE, sa.LargeBinary(), _pack)
+
+
+def downgrade() -> None:
+    for table, key, column, nullable in reversed(_COLUMNS):
+        if _is_packed(table, column):
+            _rewrite(table, key, column, nullable, sa.LargeBinary(), _JSON_TYPE, _unpack)
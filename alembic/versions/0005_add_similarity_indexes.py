@@ -0,0 +1,28 @@
+"""Add composite indexes for similarity match and vector lookups."""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0005_add_similarity_indexes"
+down_revision = "0004_pack_embeddings"
+branch_labels = None
+depends_on = None
+
+_INDEXES = (
+    ("ix_similarity_matches_proof_score", "similarity_matches", ["proof_id", "score"]),
+    ("ix_similarity_index_type_proof", "similarity_index", ["vector_type", "proof_id"]),
+)
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction on PostgreSQL.
+    with op.get_context().autocommit_block():
+        for name, table, columns in _INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
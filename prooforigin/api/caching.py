@@ -0,0 +1,24 @@
+"""HTTP caching helpers shared by the proof routers."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+
+def hash_etag(file_hash: str, anchored: bool) -> str:
+    return f'W/"{file_hash}-{int(anchored)}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def http_date(value: datetime) -> str:
+    """Format a naive UTC timestamp for ``Last-Modified`` style headers."""
+    return format_datetime(value.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+__all__ = ["etag_matches", "hash_etag", "http_date"]
@@ -1,5 +1,5 @@
 """FastAPI dependency helpers."""
-from .database import get_db
+from .database import get_async_db, get_db
 from .auth import get_current_user, oauth2_scheme
 
-__all__ = ["get_db", "get_current_user", "oauth2_scheme"]
+__all__ = ["get_db", "get_async_db", "get_current_user", "oauth2_scheme"]
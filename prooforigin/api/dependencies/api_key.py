@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 from datetime import datetime
 
 from fastapi import Depends, Header, HTTPException, status
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from prooforigin.core import models
@@ -25,8 +26,8 @@ def get_api_key_record(
 
     api_key.last_used_at = datetime.utcnow()
     db.add(api_key)
+    # Sessions keep attributes loaded across commits; the key needs no reload.
     db.commit()
-    db.refresh(api_key)
     return api_key
 
 
@@ -34,31 +35,32 @@ def get_api_key_user(api_key: models.ApiKey = Depends(get_api_key_record)) -> mo
     return api_key.user
 
 
+_METERED_ACTIONS = ("public_api.proof", "public_api.verify", "public_api.batch")
+
+
 def _enforce_plan_limits(user: models.User, db: Session) -> None:
     limits = get_plan_details(user.subscription_plan)
-    window_start = datetime.utcnow() - timedelta(minutes=1)
-    minute_usage = (
-        db.query(models.UsageLog)
-        .filter(models.UsageLog.user_id == user.id)
-        .filter(models.UsageLog.created_at >= window_start)
-        .filter(models.UsageLog.action.in_(["public_api.proof", "public_api.verify", "public_api.batch"]))
-        .count()
-    )
-    if minute_usage >= limits.per_minute:
+    now = datetime.utcnow()
+    window_start = now - timedelta(minutes=1)
+    month_start = now - timedelta(days=30)
+    # Both windows are counted in a single scan of the monthly range.
+    usage = db.execute(
+        select(
+            func.count().filter(models.UsageLog.created_at >= window_start).label("minute"),
+            func.count().label("month"),
+        ).where(
+            models.UsageLog.user_id == user.id,
+            models.UsageLog.created_at >= month_start,
+            models.UsageLog.action.in_(_METERED_ACTIONS),
+        )
+    ).one()
+    if usage.minute >= limits.per_minute:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail=f"Rate limit exceeded for {limits.name} plan",
         )
 
-    month_start = datetime.utcnow() - timedelta(days=30)
-    monthly_usage = (
-        db.query(models.UsageLog)
-        .filter(models.UsageLog.user_id == user.id)
-        .filter(models.UsageLog.created_at >= month_start)
-        .filter(models.UsageLog.action.in_(["public_api.proof", "public_api.verify", "public_api.batch"]))
-        .count()
-    )
-    if monthly_usage >= limits.monthly_quota:
+    if usage.month >= limits.monthly_quota:
         raise HTTPException(
             status_code=status.HTTP_402_PAYMENT_REQUIRED,
             detail="Monthly quota exceeded",
@@ -1,19 +1,25 @@
 """Database dependency for FastAPI routes."""
 from __future__ import annotations
 
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from prooforigin.core.database import SessionLocal
+from prooforigin.core.database import get_async_sessionmaker, get_sessionmaker
 
 
 def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
+    db = get_sessionmaker()()
     try:
         yield db
     finally:
         db.close()
 
 
-__all__ = ["get_db"]
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+__all__ = ["get_db", "get_async_db"]
@@ -1,8 +1,11 @@
 """FastAPI application factory."""
 from __future__ import annotations
 
+from functools import lru_cache
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from prooforigin.api.routers import (
     admin,
@@ -19,19 +22,34 @@ from prooforigin.api.routers import (
 )
 from prooforigin.core.database import init_database
 from prooforigin.core.logging import setup_logging
+from prooforigin.core.metadata import preload_metadata_schema
 from prooforigin.core.observability import configure_observability
 from prooforigin.core.rate_limiter import setup_rate_limiting
 from prooforigin.core.settings import get_settings
+from prooforigin.services.audit import get_audit_writer
 from prooforigin.web.router import router as web_router
 from prooforigin import tasks  # noqa: F401 - ensure tasks registered
 
 
-def create_app() -> FastAPI:
-    settings = get_settings()
+@lru_cache(maxsize=1)
+def _bootstrap() -> None:
+    """Process-wide setup, shared by every app built in this process."""
     setup_logging()
     init_database()
+    # Response models are fully built when schemas.py is imported; the
+    # metadata validator is the one thing still compiled on first use.
+    preload_metadata_schema()
+
 
-    app = FastAPI(title=settings.app_name, version="1.0.0")
+def create_app() -> FastAPI:
+    settings = get_settings()
+    _bootstrap()
+
+    app = FastAPI(
+        title=settings.app_name,
+        version="1.0.0",
+        default_response_class=ORJSONResponse,
+    )
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -42,6 +60,8 @@ def create_app() -> FastAPI:
 
     setup_rate_limiting(app)
     configure_observability(app)
+    # Write buffered audit rows before the process exits.
+    app.add_event_handler("shutdown", get_audit_writer().close)
 
     app.include_router(auth.router)
     app.include_router(proofs.router)
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from prooforigin.api import schemas
 from prooforigin.api.dependencies.auth import get_admin_user
@@ -37,12 +37,17 @@ def list_proofs(
     _: models.User = Depends(get_admin_user),
     db: Session = Depends(get_db),
 ) -> list[schemas.AdminProofSummary]:
-    proofs = db.query(models.Proof).order_by(models.Proof.created_at.desc()).all()
+    proofs = (
+        db.query(models.Proof)
+        .options(selectinload(models.Proof.matches))
+        .order_by(models.Proof.created_at.desc())
+        .all()
+    )
     summaries: list[schemas.AdminProofSummary] = []
     for proof in proofs:
         suspicious = sum(1 for match in proof.matches if match.score >= 0.8)
         summaries.append(
-            schemas.AdminProofSummary(
+            schemas.AdminProofSummary.model_construct(
                 id=proof.id,
                 user_id=proof.user_id,
                 file_name=proof.file_name,
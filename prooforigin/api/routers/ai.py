@@ -1,17 +1,17 @@
 """AI integrations for ProofOrigin."""
 from __future__ import annotations
 
-import base64
-import json
-import uuid
+from secrets import token_hex
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from prooforigin.api import schemas
 from prooforigin.api.dependencies.api_key import get_api_key_record, get_api_key_user
 from prooforigin.api.dependencies.database import get_db
 from prooforigin.core import models
+from prooforigin.core.encoding import decode_base64
 from prooforigin.services.proofs import ProofContent, ProofRegistrationService
 from prooforigin.services.webhooks import queue_event
 
@@ -28,20 +28,20 @@ def _build_metadata(payload: schemas.AIProofRequest) -> str | None:
             "prompt": payload.prompt,
         },
     )
-    return json.dumps(metadata)
+    return orjson.dumps(metadata).decode()
 
 
 def _decode_ai_payload(payload: schemas.AIProofRequest) -> tuple[ProofContent, str | None]:
     if payload.content:
         try:
-            data = base64.b64decode(payload.content)
+            data = decode_base64(payload.content)
         except Exception as exc:  # pragma: no cover - defensive
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid base64 payload") from exc
-        filename = f"ai-{uuid.uuid4().hex}.bin"
+        filename = f"ai-{token_hex(16)}.bin"
         return ProofContent(data=data, filename=filename, mime_type="application/octet-stream", is_binary=True), None
     if payload.text:
         data = payload.text.encode("utf-8")
-        filename = f"ai-{uuid.uuid4().hex}.txt"
+        filename = f"ai-{token_hex(16)}.txt"
         return ProofContent(data=data, filename=filename, mime_type="text/plain", is_binary=False), payload.text
     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing AI content")
 
@@ -49,6 +49,7 @@ def _decode_ai_payload(payload: schemas.AIProofRequest) -> tuple[ProofContent, s
 @router.post("/proof", response_model=schemas.ProofResponse)
 def register_ai_proof(
     payload: schemas.AIProofRequest,
+    background: BackgroundTasks,
     api_key: models.ApiKey = Depends(get_api_key_record),
     current_user: models.User = Depends(get_api_key_user),
     db: Session = Depends(get_db),
@@ -66,6 +67,7 @@ def register_ai_proof(
             metadata_str,
             payload.key_password,
             text_payload=text_payload,
+            commit=False,
         )
     except ValueError as exc:
         detail = str(exc)
@@ -75,10 +77,11 @@ def register_ai_proof(
     api_key.quota = max(0, api_key.quota - 1)
     db.add(api_key)
     db.commit()
-    db.refresh(api_key)
 
-    response = registration_service.build_proof_response(result.proof, result.matches, result.artifact)
-    queue_event(
+    # Event fan-out touches the database and the task queue; keep it off the response path.
+    background.add_task(registration_service.publish, result)
+    background.add_task(
+        queue_event,
         current_user.id,
         payload.webhook_event or "ai.proof.generated",
         {
@@ -87,7 +90,9 @@ def register_ai_proof(
             "prompt": payload.prompt,
         },
     )
-    return schemas.ProofResponse(**response)
+    return schemas.ProofResponse.model_construct(
+        **registration_service.build_proof_response(result.proof, result.matches, result.artifact)
+    )
 
 
 __all__ = ["router"]
@@ -62,7 +62,6 @@ def create_api_key(
     api_key = models.ApiKey(user_id=current_user.id, key=key_value, quota=current_user.credits)
     db.add(api_key)
     db.commit()
-    db.refresh(api_key)
 
     return schemas.ApiKeyResponse(
         id=api_key.id,
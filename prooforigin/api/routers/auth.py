@@ -53,18 +53,7 @@ def register_user(payload: schemas.RegisterRequest, db: Session = Depends(get_db
     db.commit()
     db.refresh(user)
 
-    return schemas.UserProfile(
-        id=user.id,
-        email=user.email,
-        display_name=user.display_name,
-        siret=user.siret,
-        kyc_level=user.kyc_level,
-        credits=user.credits,
-        is_verified=user.is_verified,
-        is_admin=user.is_admin,
-        created_at=user.created_at,
-        subscription_plan=user.subscription_plan,
-    )
+    return schemas.UserProfile.from_orm_trusted(user)
 
 
 @router.post("/login", response_model=schemas.TokenResponse)
@@ -187,18 +176,7 @@ def rotate_key(
     db.commit()
     db.refresh(current_user)
 
-    return schemas.UserProfile(
-        id=current_user.id,
-        email=current_user.email,
-        display_name=current_user.display_name,
-        siret=current_user.siret,
-        kyc_level=current_user.kyc_level,
-        credits=current_user.credits,
-        is_verified=current_user.is_verified,
-        is_admin=current_user.is_admin,
-        created_at=current_user.created_at,
-        subscription_plan=current_user.subscription_plan,
-    )
+    return schemas.UserProfile.from_orm_trusted(current_user)
 
 
 @router.post("/verify-email", status_code=status.HTTP_202_ACCEPTED)
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.orm import Session
 
 from prooforigin.api.dependencies.database import get_db
@@ -23,13 +23,13 @@ def badge_svg(file_hash: str, db: Session = Depends(get_db)) -> Response:
 
 
 @router.get("/{file_hash}.json")
-def badge_json(file_hash: str, db: Session = Depends(get_db)) -> JSONResponse:
+def badge_json(file_hash: str, db: Session = Depends(get_db)) -> ORJSONResponse:
     proof = db.query(models.Proof).filter(models.Proof.file_hash == file_hash).first()
     if not proof:
         raise HTTPException(status_code=404, detail="Proof not found")
     owner = db.get(models.User, proof.user_id)
     payload = build_badge_payload(proof, owner)
-    return JSONResponse(payload)
+    return ORJSONResponse(payload)
 
 
 __all__ = ["router"]
@@ -6,6 +6,7 @@ import uuid
 
 import stripe
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from prooforigin.api import schemas
@@ -200,36 +201,41 @@ def usage(
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> schemas.UsageResponse:
-    proofs_generated = db.query(models.Proof).filter(models.Proof.user_id == current_user.id).count()
-    verifications = (
-        db.query(models.UsageLog)
-        .filter(models.UsageLog.user_id == current_user.id)
-        .filter(models.UsageLog.action.in_(["verify_proof", "verify_proof_file"]))
-        .count()
-    )
-    last_payment = (
-        db.query(models.Payment)
-        .filter(models.Payment.user_id == current_user.id)
-        .order_by(models.Payment.created_at.desc())
-        .first()
-    )
-    next_batch = (
-        db.query(models.AnchorBatch)
-        .join(models.Proof, models.Proof.anchor_batch_id == models.AnchorBatch.id)
-        .filter(models.Proof.user_id == current_user.id)
-        .filter(models.AnchorBatch.status == "pending")
-        .order_by(models.AnchorBatch.created_at.asc())
-        .first()
-    )
+    user_id = current_user.id
+    usage_row = db.execute(
+        select(
+            select(func.count(models.Proof.id))
+            .where(models.Proof.user_id == user_id)
+            .scalar_subquery()
+            .label("proofs_generated"),
+            select(func.count(models.UsageLog.id))
+            .where(
+                models.UsageLog.user_id == user_id,
+                models.UsageLog.action.in_(["verify_proof", "verify_proof_file"]),
+            )
+            .scalar_subquery()
+            .label("verifications"),
+            select(func.max(models.Payment.created_at))
+            .where(models.Payment.user_id == user_id)
+            .scalar_subquery()
+            .label("last_payment"),
+            select(func.min(models.AnchorBatch.created_at))
+            .select_from(models.AnchorBatch)
+            .join(models.Proof, models.Proof.anchor_batch_id == models.AnchorBatch.id)
+            .where(models.Proof.user_id == user_id, models.AnchorBatch.status == "pending")
+            .scalar_subquery()
+            .label("next_anchor_batch"),
+        )
+    ).one()
 
     plan_details = get_plan_details(current_user.subscription_plan)
 
-    return schemas.UsageResponse(
-        proofs_generated=proofs_generated,
-        verifications_performed=verifications,
+    return schemas.UsageResponse.model_construct(
+        proofs_generated=usage_row.proofs_generated,
+        verifications_performed=usage_row.verifications,
         remaining_credits=current_user.credits,
-        last_payment=last_payment.created_at if last_payment else None,
-        next_anchor_batch=next_batch.created_at if next_batch else None,
+        last_payment=usage_row.last_payment,
+        next_anchor_batch=usage_row.next_anchor_batch,
         plan=plan_details.name,
         rate_limit_per_minute=plan_details.per_minute,
         monthly_quota=plan_details.monthly_quota,
@@ -4,7 +4,8 @@ from __future__ import annotations
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 
 from prooforigin.api import schemas
 from prooforigin.api.dependencies.auth import get_current_user
@@ -14,25 +15,25 @@ from prooforigin.core import models
 router = APIRouter(prefix="/api/v1", tags=["ledger"])
 
 
-def _can_access(user: models.User, proof: models.Proof) -> bool:
-    if user.is_admin:
-        return True
-    return proof.user_id == user.id
-
-
 @router.get("/ledger/{proof_id}", response_model=schemas.LedgerEntryResponse)
 def get_ledger_entry(
     proof_id: uuid.UUID,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> schemas.LedgerEntryResponse:
-    proof = db.get(models.Proof, proof_id)
+    # Ownership is part of the lookup, so a proof the caller may not see is
+    # never loaded; matches and alerts come in with it.
+    query = (
+        select(models.Proof)
+        .where(models.Proof.id == proof_id)
+        .options(selectinload(models.Proof.matches), selectinload(models.Proof.alerts))
+    )
+    if not current_user.is_admin:
+        query = query.where(models.Proof.user_id == current_user.id)
+    proof = db.scalars(query).one_or_none()
     if not proof:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Proof not found")
 
-    if not _can_access(current_user, proof):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-
     matches = [
         {
             "score": match.score,
@@ -3,18 +3,22 @@ from __future__ import annotations
 
 from datetime import datetime
 
-import hashlib
-import json
+import asyncio
+import base64
+import hmac
+import mmap
 import tempfile
 import uuid
 import zipfile
 from io import BytesIO
 from pathlib import Path
 
-from typing import Annotated
+from typing import Annotated, Any, AsyncIterator, Iterable
 
+import orjson
 from fastapi import (
     APIRouter,
+    BackgroundTasks,
     Body,
     Depends,
     File,
@@ -24,23 +28,29 @@ from fastapi import (
     UploadFile,
     status,
 )
-from fastapi.responses import Response, StreamingResponse
-from sqlalchemy.orm import Session
+from fastapi.responses import Response
+from sqlalchemy import and_, func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, raiseload, selectinload
 
 from prooforigin.api import schemas
+from prooforigin.api.caching import etag_matches, hash_etag
 from prooforigin.api.dependencies.auth import get_current_user
-from prooforigin.api.dependencies.database import get_db
+from prooforigin.api.dependencies.database import get_async_db, get_db
 from prooforigin.core import models
+from prooforigin.core.hashing import new_sha256
 from prooforigin.core.logging import get_logger
-from prooforigin.core.security import verify_signature
+from prooforigin.core.security import verify_signature_cached
 from prooforigin.core.settings import get_settings
 from prooforigin.core.rate_limiter import get_limiter
-from prooforigin.services.certificates import build_certificate
+from prooforigin.services.audit import get_audit_writer
+from prooforigin.services.certificates import get_certificate
 from prooforigin.services.proofs import (
     ProofContent,
     ProofCreationResult,
     ProofRegistrationService,
 )
+from prooforigin.services.semcache import get_semantic_cache
 from prooforigin.services.similarity import SimilarityEngine
 from prooforigin.services.storage import get_storage_service
 from prooforigin.services.webhooks import queue_event
@@ -50,33 +60,126 @@ logger = get_logger(__name__)
 router = APIRouter(prefix="/api/v1", tags=["proofs"])
 settings = get_settings()
 similarity_engine = SimilarityEngine(settings)
+semantic_cache = get_semantic_cache()
 registration_service = ProofRegistrationService(settings)
 task_queue = get_task_queue()
 storage_service = get_storage_service()
+audit_writer = get_audit_writer()
 limiter = get_limiter()
 
+_EVIDENCE_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+# Uploads below this size are kept in memory instead of being spilled to disk.
+_SPOOL_THRESHOLD = 64 * 1024
+_UPLOAD_CHUNK_SIZE = 1 << 20
+
 
 def _user_can_spend(user: models.User) -> None:
     if user.credits <= 0:
         raise HTTPException(status_code=status.HTTP_402_PAYMENT_REQUIRED, detail="Insufficient credits")
 
 
-def _write_temp_file(data: bytes) -> Path:
-    tmp_dir = settings.data_dir / "tmp"
-    tmp_dir.mkdir(parents=True, exist_ok=True)
-    with tempfile.NamedTemporaryFile(delete=False, dir=tmp_dir) as tmp:
+def _write_temp_file(data: bytes) -> BytesIO | Path:
+    if len(data) < _SPOOL_THRESHOLD:
+        return BytesIO(data)
+    with tempfile.NamedTemporaryFile(delete=False, dir=settings.resolved_tmp_dir) as tmp:
         tmp.write(data)
         path = Path(tmp.name)
     return path
 
 
-def _to_proof_response(result: ProofCreationResult) -> schemas.ProofResponse:
-    payload = registration_service.build_proof_response(
-        result.proof,
-        result.matches,
-        result.artifact,
+async def _iter_upload_chunks(
+    upload: UploadFile,
+    chunk_size: int = _UPLOAD_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    while chunk := await upload.read(chunk_size):
+        yield chunk
+
+
+async def _stream_and_hash(upload: UploadFile) -> tuple[bytes | Path, str, int]:
+    """Hash an upload in a single pass, spilling it to disk only past the memory limit."""
+    digest = new_sha256()
+    buffer = bytearray()
+    spool = None
+    size = 0
+    try:
+        async for chunk in _iter_upload_chunks(upload):
+            digest.update(chunk)
+            size += len(chunk)
+            if spool is None and size > settings.upload_memory_limit:
+                spool = tempfile.NamedTemporaryFile(delete=False, dir=settings.resolved_tmp_dir)
+                spool.write(buffer)
+                buffer = bytearray()
+            if spool is not None:
+                spool.write(chunk)
+            else:
+                buffer += chunk
+    except BaseException:
+        if spool is not None:
+            spool.close()
+            Path(spool.name).unlink(missing_ok=True)
+        raise
+    if spool is None:
+        return bytes(buffer), digest.hexdigest(), size
+    spool.close()
+    return Path(spool.name), digest.hexdigest(), size
+
+
+async def _spooled_upload_content(upload: UploadFile) -> ProofContent:
+    source, file_hash, size = await _stream_and_hash(upload)
+    if not size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty upload")
+    return ProofContent(
+        data=source if isinstance(source, bytes) else None,
+        filename=upload.filename or f"upload-{uuid.uuid4().hex}",
+        mime_type=upload.content_type,
+        is_binary=True,
+        path=source if isinstance(source, Path) else None,
+        file_hash=file_hash,
+        size=size,
+        spooled=isinstance(source, Path),
+    )
+
+
+def _index_proof_similarity(
+    proof_id: uuid.UUID,
+    content: ProofContent,
+    text_payload: str | None,
+) -> None:
+    image = (content.path or content.data) if content.is_binary else None
+    try:
+        registration_service.index_similarity(proof_id, image, text_payload)
+    except Exception as exc:  # pragma: no cover - background safety net
+        logger.error("similarity_index_failed", proof_id=str(proof_id), error=str(exc))
+    finally:
+        content.discard()
+
+
+def _matches_payload(proof: models.Proof) -> list[dict[str, object]]:
+    payload = []
+    for match in proof.matches:
+        matched_id = match.matched_proof_id
+        payload.append(
+            {
+                "score": match.score,
+                "proof_id": str(matched_id) if matched_id else None,
+                "metrics": match.details or {},
+            }
+        )
+    return payload
+
+
+def _proof_response(
+    proof: models.Proof,
+    matches: Iterable[dict[str, object]],
+    artifact: dict[str, object] | None = None,
+) -> schemas.ProofResponse:
+    return schemas.ProofResponse.model_construct(
+        **registration_service.build_proof_response(proof, matches, artifact)
     )
-    return schemas.ProofResponse(**payload)
+
+
+def _to_proof_response(result: ProofCreationResult) -> schemas.ProofResponse:
+    return _proof_response(result.proof, result.matches, result.artifact)
 
 
 def _build_evidence_pack(
@@ -85,10 +188,10 @@ def _build_evidence_pack(
     report_payload: dict[str, object],
 ) -> str:
     buffer = BytesIO()
-    with zipfile.ZipFile(buffer, "w") as archive:
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
         archive.writestr(
             "proof.json",
-            json.dumps(
+            orjson.dumps(
                 {
                     "proof_id": str(proof.id),
                     "file_hash": proof.file_hash,
@@ -98,27 +201,25 @@ def _build_evidence_pack(
                     "blockchain_tx": proof.blockchain_tx,
                     "anchor_signature": proof.anchor_signature,
                 },
-                ensure_ascii=False,
-                indent=2,
+                option=_EVIDENCE_JSON_OPTIONS,
             ),
         )
         if match:
             archive.writestr(
                 "similarity.json",
-                json.dumps(
+                orjson.dumps(
                     {
                         "match_id": match.id,
                         "matched_proof_id": str(match.matched_proof_id) if match.matched_proof_id else None,
                         "score": match.score,
                         "metrics": match.details or {},
                     },
-                    ensure_ascii=False,
-                    indent=2,
+                    option=_EVIDENCE_JSON_OPTIONS,
                 ),
             )
         archive.writestr(
             "report.json",
-            json.dumps(report_payload, ensure_ascii=False, indent=2),
+            orjson.dumps(report_payload, option=_EVIDENCE_JSON_OPTIONS),
         )
     buffer.seek(0)
     return storage_service.store(buffer, filename=f"report-{uuid.uuid4().hex}.zip")
@@ -127,6 +228,7 @@ def _build_evidence_pack(
 @router.post("/generate_proof", response_model=schemas.ProofResponse)
 async def generate_proof(
     request: Request,
+    background: BackgroundTasks,
     file: UploadFile = File(...),
     metadata: str | None = Form(default=None),
     key_password: str = Form(...),
@@ -134,36 +236,39 @@ async def generate_proof(
     db: Session = Depends(get_db),
 ) -> schemas.ProofResponse:
     _user_can_spend(current_user)
-    file_bytes = await file.read()
-    if not file_bytes:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty upload")
-
-    filename = file.filename or f"upload-{uuid.uuid4().hex}"
-    content = ProofContent(
-        data=file_bytes,
-        filename=filename,
-        mime_type=file.content_type,
-        is_binary=True,
-    )
+    content = await _spooled_upload_content(file)
+    result: ProofCreationResult | None = None
     try:
-        result = registration_service.register_content(
+        # Key decryption runs Argon2; keep it off the event loop.
+        result = await asyncio.to_thread(
+            registration_service.register_content,
             db,
             current_user,
             content,
             metadata,
             key_password,
+            defer_similarity=True,
+            publish=False,
         )
     except ValueError as exc:
         detail = str(exc)
         status_code = status.HTTP_409_CONFLICT if "exists" in detail.lower() else status.HTTP_400_BAD_REQUEST
         raise HTTPException(status_code=status_code, detail=detail) from exc
-
+    finally:
+        if result is None:
+            content.discard()
+
+    # Webhook fan-out and indexing run once the response is sent; the indexing
+    # task also removes any spool file when done.
+    background.add_task(registration_service.publish, result)
+    background.add_task(_index_proof_similarity, result.proof.id, content, None)
     return _to_proof_response(result)
 
 
 @router.post("/register", response_model=schemas.ProofResponse)
 async def register_creation(
     request: Request,
+    background: BackgroundTasks,
     file: UploadFile | None = File(default=None),
     text: str | None = Form(default=None),
     metadata: str | None = Form(default=None),
@@ -179,16 +284,7 @@ async def register_creation(
 
     text_payload: str | None = text
     if file:
-        file_bytes = await file.read()
-        if not file_bytes:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty upload")
-        filename = file.filename or f"upload-{uuid.uuid4().hex}"
-        content = ProofContent(
-            data=file_bytes,
-            filename=filename,
-            mime_type=file.content_type,
-            is_binary=True,
-        )
+        content = await _spooled_upload_content(file)
     else:
         assert text is not None
         text_bytes = text.encode("utf-8")
@@ -200,72 +296,100 @@ async def register_creation(
             is_binary=False,
         )
 
+    result: ProofCreationResult | None = None
     try:
-        result = registration_service.register_content(
+        # Key decryption runs Argon2; keep it off the event loop.
+        result = await asyncio.to_thread(
+            registration_service.register_content,
             db,
             current_user,
             content,
             metadata,
             key_password,
             text_payload=text_payload,
+            defer_similarity=True,
+            publish=False,
         )
     except ValueError as exc:
         detail = str(exc)
         status_code = status.HTTP_409_CONFLICT if "exists" in detail.lower() else status.HTTP_400_BAD_REQUEST
         raise HTTPException(status_code=status_code, detail=detail) from exc
+    finally:
+        if result is None:
+            content.discard()
 
+    background.add_task(registration_service.publish, result)
+    background.add_task(_index_proof_similarity, result.proof.id, content, text_payload)
     return _to_proof_response(result)
 
 
+def _log_hash_verification(
+    file_hash: str,
+    proof_id: uuid.UUID | None,
+    owner_id: uuid.UUID | None,
+    requester_ip: str | None,
+) -> None:
+    audit_writer.verification(file_hash, proof_id, proof_id is not None, requester_ip)
+    if proof_id and owner_id:
+        audit_writer.usage(owner_id, "verify_hash", {"proof_id": str(proof_id)})
+
+
 @router.get("/verify/{file_hash}", response_model=schemas.HashVerificationResponse)
-def verify_by_hash(
+async def verify_by_hash(
     file_hash: str,
     request: Request,
-    db: Session = Depends(get_db),
-) -> schemas.HashVerificationResponse:
-    proof, owner = registration_service.verify_hash(db, file_hash)
-    verification = models.Verification(
-        proof_id=proof.id if proof else None,
-        hash=file_hash,
-        success=proof is not None,
-        requester_ip=request.client.host if request.client else None,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+) -> schemas.HashVerificationResponse | Response:
+    proof = await registration_service.lookup_hash_async(db, file_hash)
+    _log_hash_verification(
+        file_hash,
+        proof.proof_id if proof else None,
+        proof.user_id if proof else None,
+        request.client.host if request.client else None,
     )
-    db.add(verification)
-    if proof:
-        db.add(
-            models.UsageLog(
-                user_id=proof.user_id,
-                action="verify_hash",
-                metadata_json={"proof_id": str(proof.id)},
+
+    if proof is None:
+        # A missing hash may be registered at any time, never let caches keep it.
+        response.headers["Cache-Control"] = "no-cache"
+    else:
+        anchored = bool(proof.blockchain_tx)
+        etag = hash_etag(proof.file_hash, anchored)
+        cache_control = "public, max-age=300, immutable" if anchored else "public, max-age=300"
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag, "Cache-Control": cache_control},
             )
-        )
-    db.commit()
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = cache_control
 
     return schemas.HashVerificationResponse(
         exists=proof is not None,
-        proof_id=proof.id if proof else None,
+        proof_id=proof.proof_id if proof else None,
         created_at=proof.created_at if proof else None,
-        owner_id=owner.id if owner else None,
-        owner_email=owner.email if owner else None,
+        owner_id=proof.user_id if proof else None,
+        owner_email=proof.owner_email if proof else None,
         anchored=bool(proof.blockchain_tx) if proof else False,
         blockchain_tx=proof.blockchain_tx if proof else None,
     )
 
 
 @router.post("/verify_proof", response_model=schemas.VerifyResult)
-def verify_proof(
+async def verify_proof(
     request: Request,
     payload: schemas.VerifyRequest,
-    db: Session = Depends(get_db),
+    background: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
 ) -> schemas.VerifyResult:
     if not payload.proof_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="proof_id required")
 
-    proof = db.get(models.Proof, payload.proof_id)
+    proof = await db.get(models.Proof, payload.proof_id)
     if not proof:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Proof not found")
 
-    user = db.get(models.User, proof.user_id)
+    user = await db.get(models.User, proof.user_id)
     public_key = user.public_key if user else None
     if not public_key:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Missing author key")
@@ -274,26 +398,18 @@ def verify_proof(
     if not signature:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Signature required")
 
-    valid_signature = verify_signature(proof.file_hash, signature, public_key)
+    valid_signature = verify_signature_cached(proof.file_hash, signature, public_key)
 
-    db.add(
-        models.UsageLog(
-            user_id=proof.user_id,
-            action="verify_proof",
-            metadata_json={"proof_id": str(proof.id)},
-        )
-    )
-    db.add(
-        models.Verification(
-            proof_id=proof.id,
-            hash=proof.file_hash,
-            success=valid_signature,
-            requester_ip=request.client.host if request.client else None,
-        )
+    audit_writer.usage(proof.user_id, "verify_proof", {"proof_id": str(proof.id)})
+    audit_writer.verification(
+        proof.file_hash,
+        proof.id,
+        valid_signature,
+        request.client.host if request.client else None,
     )
-    db.commit()
 
-    queue_event(
+    background.add_task(
+        queue_event,
         proof.user_id,
         "proof.verified",
         {
@@ -316,6 +432,7 @@ def verify_proof(
 @router.post("/verify_proof/file", response_model=schemas.VerifyResult)
 async def verify_proof_with_file(
     request: Request,
+    background: BackgroundTasks,
     proof_id: uuid.UUID = Form(...),
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
@@ -324,10 +441,21 @@ async def verify_proof_with_file(
     if not proof:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Proof not found")
 
-    file_bytes = await file.read()
-    file_hash = hashlib.sha256(file_bytes).hexdigest()
+    # A size mismatch already proves a hash mismatch, so bail out before (or
+    # while) reading the upload instead of hashing it to the end.
+    expected_size = proof.file_size
+    if expected_size is not None and file.size is not None and file.size != expected_size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Hash mismatch")
+
+    digest = new_sha256()
+    received = 0
+    async for chunk in _iter_upload_chunks(file):
+        received += len(chunk)
+        if expected_size is not None and received > expected_size:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Hash mismatch")
+        digest.update(chunk)
 
-    if file_hash != proof.file_hash:
+    if not hmac.compare_digest(digest.hexdigest(), proof.file_hash):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Hash mismatch")
 
     user = db.get(models.User, proof.user_id)
@@ -335,26 +463,18 @@ async def verify_proof_with_file(
     if not public_key:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Missing author key")
 
-    valid_signature = verify_signature(proof.file_hash, proof.signature, public_key)
+    valid_signature = verify_signature_cached(proof.file_hash, proof.signature, public_key)
 
-    db.add(
-        models.UsageLog(
-            user_id=proof.user_id,
-            action="verify_proof_file",
-            metadata_json={"proof_id": str(proof.id)},
-        )
+    audit_writer.usage(proof.user_id, "verify_proof_file", {"proof_id": str(proof.id)})
+    audit_writer.verification(
+        proof.file_hash,
+        proof.id,
+        valid_signature,
+        request.client.host if request.client else None,
     )
-    db.add(
-        models.Verification(
-            proof_id=proof.id,
-            hash=proof.file_hash,
-            success=valid_signature,
-            requester_ip=request.client.host if request.client else None,
-        )
-    )
-    db.commit()
 
-    queue_event(
+    background.add_task(
+        queue_event,
         proof.user_id,
         "proof.verified",
         {
@@ -379,43 +499,82 @@ def list_user_proofs(
     page: int = 1,
     page_size: int = 20,
     anchored: bool | None = None,
+    cursor: str | None = None,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> schemas.ProofListResponse:
-    query = db.query(models.Proof).filter(models.Proof.user_id == current_user.id)
+    conditions = [models.Proof.user_id == current_user.id]
     if anchored is not None:
         if anchored:
-            query = query.filter(models.Proof.blockchain_tx.isnot(None))
+            conditions.append(models.Proof.blockchain_tx.isnot(None))
         else:
-            query = query.filter(models.Proof.blockchain_tx.is_(None))
-
-    total = query.count()
-    proofs = query.order_by(models.Proof.created_at.desc()).offset((page - 1) * page_size).limit(page_size).all()
-    items = [
-        schemas.ProofResponse(
-            id=proof.id,
-            file_hash=proof.file_hash,
-            signature=proof.signature,
-            metadata=proof.metadata_json,
-            anchored_at=proof.anchored_at,
-            blockchain_tx=proof.blockchain_tx,
-            created_at=proof.created_at,
-            file_name=proof.file_name,
-            mime_type=proof.mime_type,
-            file_size=proof.file_size,
-            matches=[
-                {
-                    "score": match.score,
-                    "proof_id": str(match.matched_proof_id) if match.matched_proof_id else None,
-                    "metrics": match.details or {},
-                }
-                for match in proof.matches
-            ],
-            anchor_batch_id=proof.anchor_batch_id,
-        )
-        for proof in proofs
-    ]
-    return schemas.ProofListResponse(items=items, total=total, page=page, page_size=page_size)
+            conditions.append(models.Proof.blockchain_tx.is_(None))
+
+    # With a cursor (the position of the last item seen) the page is found by
+    # seeking the index rather than skipping rows. Ids break created_at ties,
+    # which batch registration makes common.
+    page_conditions = list(conditions)
+    if cursor is not None:
+        cursor_created_at, cursor_id = _decode_list_cursor(cursor)
+        page_conditions.append(tuple_(models.Proof.created_at, models.Proof.id) < (cursor_created_at, cursor_id))
+        offset = 0
+    else:
+        offset = (page - 1) * page_size
+
+    # One query for the page and its total, one for every match on it. Any
+    # other relationship touched while serialising raises instead of
+    # quietly issuing a query per proof.
+    rows = db.execute(
+        select(models.Proof, func.count().over().label("total"))
+        .where(*page_conditions)
+        .options(selectinload(models.Proof.matches), raiseload("*"))
+        .order_by(models.Proof.created_at.desc(), models.Proof.id.desc())
+        .offset(offset)
+        .limit(page_size)
+    ).all()
+    proofs = [row[0] for row in rows]
+    if cursor is None and rows:
+        total = rows[0].total
+    elif cursor is None and not offset:
+        total = 0
+    else:
+        # The window only counts rows past the cursor, and past the last page
+        # it has no rows to report on; total always covers every match.
+        total = db.scalar(select(func.count()).select_from(models.Proof).where(*conditions))
+    next_cursor = _encode_list_cursor(proofs[-1]) if len(proofs) == page_size else None
+    return schemas.ProofListResponse.model_construct(
+        items=[_proof_response(proof, _matches_payload(proof)) for proof in proofs],
+        total=total,
+        page=page,
+        page_size=page_size,
+        next_cursor=next_cursor,
+    )
+
+
+def _encode_list_cursor(proof: models.Proof) -> str:
+    raw = f"{proof.created_at.isoformat()}|{proof.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_list_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, proof_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(proof_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+def _owned_proof(db: Session, proof_id: uuid.UUID, user_id: uuid.UUID, *options: Any) -> models.Proof:
+    """Load a proof only if ``user_id`` owns it; other users' proofs are never read."""
+    proof = db.scalars(
+        select(models.Proof)
+        .where(models.Proof.id == proof_id, models.Proof.user_id == user_id)
+        .options(*options)
+    ).one_or_none()
+    if proof is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Proof not found")
+    return proof
 
 
 @router.get("/proofs/{proof_id}", response_model=schemas.ProofResponse)
@@ -424,33 +583,8 @@ def get_proof(
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> schemas.ProofResponse:
-    proof = db.get(models.Proof, proof_id)
-    if not proof or proof.user_id != current_user.id:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Proof not found")
-
-    matches = [
-        {
-            "score": match.score,
-            "proof_id": str(match.matched_proof_id) if match.matched_proof_id else None,
-            "metrics": match.details or {},
-        }
-        for match in proof.matches
-    ]
-
-    return schemas.ProofResponse(
-        id=proof.id,
-        file_hash=proof.file_hash,
-        signature=proof.signature,
-        metadata=proof.metadata_json,
-        anchored_at=proof.anchored_at,
-        blockchain_tx=proof.blockchain_tx,
-        created_at=proof.created_at,
-        file_name=proof.file_name,
-        mime_type=proof.mime_type,
-        file_size=proof.file_size,
-        matches=matches,
-        anchor_batch_id=proof.anchor_batch_id,
-    )
+    proof = _owned_proof(db, proof_id, current_user.id, selectinload(models.Proof.matches))
+    return _proof_response(proof, _matches_payload(proof))
 
 
 @router.get("/proof/{proof_id}", response_model=schemas.ProofResponse)
@@ -465,30 +599,88 @@ def get_proof_details(
 @router.get("/proof/{proof_id}/certificate")
 def download_certificate(
     proof_id: uuid.UUID,
+    background: BackgroundTasks,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> StreamingResponse:
-    proof = db.get(models.Proof, proof_id)
-    if not proof or proof.user_id != current_user.id:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Proof not found")
-
-    pdf_bytes = build_certificate(proof, current_user)
-    queue_event(
+) -> Response:
+    proof = _owned_proof(db, proof_id, current_user.id)
+    pdf_bytes = get_certificate(proof, current_user)
+    background.add_task(
+        queue_event,
         current_user.id,
         "proof.certificate.generated",
         {"proof_id": str(proof.id), "generated_at": datetime.utcnow().isoformat()},
     )
-    return StreamingResponse(
-        BytesIO(pdf_bytes),
+    # The PDF is rendered in one piece, so send it as a single body.
+    return Response(
+        content=pdf_bytes,
         media_type="application/pdf",
         headers={"Content-Disposition": f'attachment; filename="proof-{proof.id}.pdf"'},
     )
 
 
+def _collect_candidate_ids(candidates: list[str], target: set[uuid.UUID]) -> None:
+    for candidate in candidates:
+        try:
+            target.add(uuid.UUID(candidate))
+        except ValueError:
+            continue
+
+
+async def _image_similarity_pipeline(
+    file: UploadFile,
+    user_id: uuid.UUID,
+    top_k: int,
+) -> tuple[tuple[str | None, str | None, list[float] | None, list[float] | None], list[str]]:
+    source = _write_temp_file(await file.read())
+    try:
+        return await asyncio.to_thread(_image_similarity_lookup, source, user_id, top_k)
+    finally:
+        if isinstance(source, Path):
+            source.unlink(missing_ok=True)
+
+
+def _image_similarity_lookup(
+    source: BytesIO | Path,
+    user_id: uuid.UUID,
+    top_k: int,
+) -> tuple[tuple[str | None, str | None, list[float] | None, list[float] | None], list[str]]:
+    if isinstance(source, Path):
+        # Spooled uploads are mapped rather than read so PIL pages the image in on demand.
+        with source.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            hashes = similarity_engine.compute_image_hashes(mapped)
+    else:
+        hashes = similarity_engine.compute_image_hashes(source)
+    return hashes, similarity_engine.query_vector_store("clip", hashes[3], top_k=top_k, user_id=user_id)
+
+
+def _text_similarity_pipeline(
+    text: str,
+    user_id: uuid.UUID,
+    top_k: int,
+) -> tuple[list[float] | None, list[str]]:
+    embedding = similarity_engine.compute_text_embedding(text)
+    return embedding, similarity_engine.query_vector_store("text", embedding, top_k=top_k, user_id=user_id)
+
+
+def _queue_similarity_event(background: BackgroundTasks, user_id: uuid.UUID, matches: int) -> None:
+    background.add_task(
+        queue_event,
+        user_id,
+        "similarity.requested",
+        {
+            "proof_id": None,
+            "matches": matches,
+            "requested_at": datetime.utcnow().isoformat(),
+        },
+    )
+
+
 @router.post("/search-similar")
 async def search_similar(
     request: Request,
     payload: Annotated[schemas.SimilarityRequest, Body(embed=True)],
+    background: BackgroundTasks,
     file: UploadFile | None = File(default=None),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -502,28 +694,63 @@ async def search_similar(
     text_embedding = None
 
     candidate_ids: set[uuid.UUID] = set()
+    candidate_top_k = payload.top_k * 3
 
-    if file:
-        file_bytes = await file.read()
-        temp_path = _write_temp_file(file_bytes)
-        phash, dhash, perceptual_vector, clip_vector = similarity_engine.compute_image_hashes(temp_path)
-        temp_path.unlink(missing_ok=True)
-        for candidate in similarity_engine.query_vector_store("clip", clip_vector, top_k=payload.top_k * 3):
-            try:
-                candidate_ids.add(uuid.UUID(candidate))
-            except ValueError:
-                continue
-
-    if payload.text:
-        text_embedding = similarity_engine.compute_text_embedding(payload.text)
-        for candidate in similarity_engine.query_vector_store("text", text_embedding, top_k=payload.top_k * 3):
-            try:
-                candidate_ids.add(uuid.UUID(candidate))
-            except ValueError:
-                continue
+    image_task = (
+        asyncio.create_task(_image_similarity_pipeline(file, current_user.id, candidate_top_k))
+        if file
+        else None
+    )
+    text_task = (
+        asyncio.create_task(
+            asyncio.to_thread(_text_similarity_pipeline, payload.text, current_user.id, candidate_top_k)
+        )
+        if payload.text
+        else None
+    )
+    await asyncio.gather(*filter(None, (image_task, text_task)))
+
+    if image_task is not None:
+        (phash, dhash, perceptual_vector, clip_vector), image_candidates = image_task.result()
+        _collect_candidate_ids(image_candidates, candidate_ids)
+    if text_task is not None:
+        text_embedding, text_candidates = text_task.result()
+        _collect_candidate_ids(text_candidates, candidate_ids)
+
+    # Perceptual hashes feed the per-match metrics, so a cached payload is only
+    # reused for a query image with the same hashes.
+    cache_scope = (payload.top_k, clip_vector is not None, text_embedding is not None, phash, dhash)
+    cache_vector = semantic_cache.query_vector(clip_vector, text_embedding)
+    cached = (
+        semantic_cache.lookup(current_user.id, cache_scope, cache_vector) if cache_vector is not None else None
+    )
+    if cached is not None:
+        _queue_similarity_event(background, current_user.id, len(cached))
+        return cached
+
+    if not candidate_ids:
+        # Without a FAISS index, shortlist candidates with one matrix-vector product per embedding kind.
+        for vector_type, vector in (("clip", clip_vector), ("text", text_embedding)):
+            candidate_ids.update(
+                similarity_engine.rank_user_candidates(db, current_user.id, vector_type, vector, candidate_top_k)
+            )
 
     if candidate_ids:
-        candidate_proofs = query.filter(models.Proof.id.in_(candidate_ids)).all()
+        # FAISS already searched this user's vectors only; the owner filter on
+        # the query stays as a safety net. Proofs indexed with perceptual
+        # hashes alone never appear in an embedding shortlist, so they stay
+        # candidates whenever the query carries a perceptual hash.
+        shortlisted = models.Proof.id.in_(candidate_ids)
+        if phash is not None:
+            shortlisted = or_(
+                shortlisted,
+                and_(
+                    models.Proof.phash.isnot(None),
+                    models.Proof.image_embedding.is_(None),
+                    models.Proof.text_embedding.is_(None),
+                ),
+            )
+        candidate_proofs = query.filter(shortlisted).all()
     else:
         candidate_proofs = query.all()
 
@@ -539,21 +766,16 @@ async def search_similar(
     )
 
     results = similarity_engine.build_similarity_payload(dummy_proof, candidate_proofs, top_k=payload.top_k)
-    queue_event(
-        current_user.id,
-        "similarity.requested",
-        {
-            "proof_id": payload.proof_id and str(payload.proof_id),
-            "matches": len(results),
-            "requested_at": datetime.utcnow().isoformat(),
-        },
-    )
+    if cache_vector is not None:
+        semantic_cache.store(current_user.id, cache_scope, cache_vector, results)
+    _queue_similarity_event(background, current_user.id, len(results))
     return results
 
 
 @router.post("/batch-verify", response_model=schemas.BatchVerifyResponse, status_code=status.HTTP_202_ACCEPTED)
 def batch_verify(
     payload: schemas.BatchVerifyRequest,
+    background: BackgroundTasks,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> schemas.BatchVerifyResponse:
@@ -567,7 +789,8 @@ def batch_verify(
     db.commit()
     db.refresh(job)
 
-    queue_event(
+    background.add_task(
+        queue_event,
         current_user.id,
         "batch.verify_requested",
         {
@@ -577,6 +800,12 @@ def batch_verify(
             "webhook": payload.webhook_url,
         },
     )
+    background.add_task(
+        task_queue.enqueue,
+        "prooforigin.batch_verify",
+        str(job.id),
+        [str(pid) for pid in payload.proof_ids],
+    )
 
     return schemas.BatchVerifyResponse(job_id=job.id, status=job.status)
 
@@ -584,6 +813,7 @@ def batch_verify(
 @router.post("/report", response_model=schemas.ReportResponse, status_code=status.HTTP_201_CREATED)
 def create_report(
     payload: schemas.ReportRequest,
+    background: BackgroundTasks,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> schemas.ReportResponse:
@@ -615,7 +845,8 @@ def create_report(
     db.commit()
     db.refresh(report)
 
-    queue_event(
+    background.add_task(
+        queue_event,
         current_user.id,
         "report.created",
         {
@@ -1,34 +1,48 @@
 """Public Proof-as-a-Service endpoints backed by API keys."""
 from __future__ import annotations
 
-import base64
-import json
 import uuid
+from contextlib import nullcontext
+from secrets import token_hex
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from prooforigin.api import schemas
 from prooforigin.api.dependencies.api_key import get_api_key_record, get_api_key_user
-from prooforigin.api.dependencies.database import get_db
+from prooforigin.api.dependencies.database import get_async_db, get_db
 from prooforigin.core import models
+from prooforigin.core.encoding import decode_base64
+from prooforigin.core.hashing import hash_many
 from prooforigin.core.plans import get_plan_details
 from prooforigin.core.logging import get_logger
-from prooforigin.services.proofs import ProofContent, ProofRegistrationService
+from prooforigin.services.audit import get_audit_writer
+from prooforigin.services.proofs import (
+    ProofContent,
+    ProofCreationResult,
+    ProofRegistrationService,
+)
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/api/v1", tags=["public-api"])
 registration_service = ProofRegistrationService()
+audit_writer = get_audit_writer()
 
 
-def _decode_payload(item: schemas.ProofSubmission) -> tuple[ProofContent, str | None]:
+def _decode_payload(
+    item: schemas.ProofSubmission | schemas.BatchProofItem,
+) -> tuple[ProofContent, str | None]:
     if item.content:
         try:
-            data = base64.b64decode(item.content)
+            data = decode_base64(item.content)
         except Exception as exc:  # pragma: no cover - defensive
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid base64 content") from exc
-        filename = item.filename or f"upload-{uuid.uuid4().hex}"
+        filename = item.filename or f"upload-{token_hex(16)}"
         return (
             ProofContent(
                 data=data,
@@ -40,7 +54,7 @@ def _decode_payload(item: schemas.ProofSubmission) -> tuple[ProofContent, str |
         )
     if item.text:
         data = item.text.encode("utf-8")
-        filename = item.filename or f"text-{uuid.uuid4().hex}.txt"
+        filename = item.filename or f"text-{token_hex(16)}.txt"
         return (
             ProofContent(
                 data=data,
@@ -57,9 +71,32 @@ def _to_response(result: schemas.ProofResponse) -> schemas.ProofResponse:
     return result
 
 
+def _encode_metadata(payload: schemas.ProofSubmission | schemas.BatchProofItem) -> str | None:
+    return orjson.dumps(payload.metadata).decode() if payload.metadata else None
+
+
+def _build_response(result: ProofCreationResult) -> schemas.ProofResponse:
+    return schemas.ProofResponse.model_construct(
+        **registration_service.build_proof_response(result.proof, result.matches, result.artifact)
+    )
+
+
+def _index_batch_similarity(entries: list[tuple[uuid.UUID, ProofContent, str | None]]) -> None:
+    """Index a committed batch, one proof after another, once the response is sent."""
+    for proof_id, content, text_payload in entries:
+        image = (content.path or content.data) if content.is_binary else None
+        try:
+            registration_service.index_similarity(proof_id, image, text_payload)
+        except Exception as exc:  # pragma: no cover - background safety net
+            logger.error("similarity_index_failed", proof_id=str(proof_id), error=str(exc))
+        finally:
+            content.discard()
+
+
 @router.post("/proof", response_model=schemas.ProofResponse)
 def api_register_proof(
     payload: schemas.ProofSubmission,
+    background: BackgroundTasks,
     api_key: models.ApiKey = Depends(get_api_key_record),
     current_user: models.User = Depends(get_api_key_user),
     db: Session = Depends(get_db),
@@ -68,15 +105,31 @@ def api_register_proof(
         raise HTTPException(status_code=status.HTTP_402_PAYMENT_REQUIRED, detail="API quota exceeded")
 
     content, text_payload = _decode_payload(payload)
-    metadata_str = json.dumps(payload.metadata) if payload.metadata else None
+    result = _register_single(db, api_key, current_user, content, text_payload, payload)
+    # Proof, quota and usage log land in one transaction.
+    db.commit()
+    background.add_task(registration_service.publish, result)
+    return _build_response(result)
+
+
+def _register_single(
+    db: Session,
+    api_key: models.ApiKey,
+    current_user: models.User,
+    content: ProofContent,
+    text_payload: str | None,
+    payload: schemas.ProofSubmission,
+) -> ProofCreationResult:
+    """Register one submission and charge the key without committing."""
     try:
         result = registration_service.register_content(
             db,
             current_user,
             content,
-            metadata_str,
+            _encode_metadata(payload),
             payload.key_password,
             text_payload=text_payload,
+            commit=False,
         )
     except ValueError as exc:
         detail = str(exc)
@@ -92,49 +145,69 @@ def api_register_proof(
             metadata_json={"proof_id": str(result.proof.id)},
         )
     )
-    db.commit()
-    db.refresh(api_key)
+    return result
+
 
-    response = registration_service.build_proof_response(result.proof, result.matches, result.artifact)
-    return schemas.ProofResponse(**response)
+_BatchEntry = tuple[ProofCreationResult, ProofContent, str | None]
+
+
+def _record_batch_usage(
+    db: Session,
+    api_key: models.ApiKey,
+    current_user: models.User,
+    registered: list[_BatchEntry],
+    submitted: int,
+) -> None:
+    """Charge the key for ``registered`` and add the batch's usage rows."""
+    api_key.quota = max(0, api_key.quota - len(registered))
+    db.add(api_key)
+    # One executemany for every usage row instead of an ORM INSERT per object.
+    db.execute(
+        insert(models.UsageLog),
+        [
+            {
+                "user_id": current_user.id,
+                "action": "public_api.proof",
+                "metadata_json": {"proof_id": str(result.proof.id)},
+            }
+            for result, _, _ in registered
+        ]
+        + [
+            {
+                "user_id": current_user.id,
+                "action": "public_api.batch",
+                "metadata_json": {"items": submitted},
+            }
+        ],
+    )
 
 
 @router.get("/verify/{file_hash}", response_model=schemas.HashVerificationResponse)
-def api_verify_hash(
+async def api_verify_hash(
     file_hash: str,
     requester: models.User = Depends(get_api_key_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> schemas.HashVerificationResponse:
-    proof, owner = registration_service.verify_hash(db, file_hash)
-    verification = models.Verification(
-        proof_id=proof.id if proof else None,
-        hash=file_hash,
-        success=proof is not None,
-        requester_ip=str(requester.id),
-    )
-    db.add(verification)
+    proof = await registration_service.lookup_hash_async(db, file_hash)
+    # Metered rows feed the plan limits, so they are written before responding
+    # rather than through the buffered audit writer.
     db.add(
         models.UsageLog(
             user_id=requester.id,
             action="public_api.verify",
-            metadata_json={"hash": file_hash, "proof_id": str(proof.id) if proof else None},
+            metadata_json={"hash": file_hash, "proof_id": str(proof.proof_id) if proof else None},
         )
     )
+    await db.commit()
+    audit_writer.verification(file_hash, proof.proof_id if proof else None, proof is not None, str(requester.id))
     if proof:
-        db.add(
-            models.UsageLog(
-                user_id=proof.user_id,
-                action="verify_hash",
-                metadata_json={"proof_id": str(proof.id)},
-            )
-        )
-    db.commit()
+        audit_writer.usage(proof.user_id, "verify_hash", {"proof_id": str(proof.proof_id)})
     return schemas.HashVerificationResponse(
         exists=proof is not None,
-        proof_id=proof.id if proof else None,
+        proof_id=proof.proof_id if proof else None,
         created_at=proof.created_at if proof else None,
-        owner_id=owner.id if owner else None,
-        owner_email=owner.email if owner else None,
+        owner_id=proof.user_id if proof else None,
+        owner_email=proof.owner_email if proof else None,
         anchored=bool(proof.blockchain_tx) if proof else False,
         blockchain_tx=proof.blockchain_tx if proof else None,
     )
@@ -143,74 +216,177 @@ def api_verify_hash(
 @router.post("/batch", response_model=schemas.BatchProofResponsePayload)
 def api_batch_register(
     payload: schemas.BatchProofRequest,
+    background: BackgroundTasks,
     api_key: models.ApiKey = Depends(get_api_key_record),
     current_user: models.User = Depends(get_api_key_user),
     db: Session = Depends(get_db),
 ) -> schemas.BatchProofResponsePayload:
-    results: list[schemas.BatchProofResult] = []
-    for item in payload.items:
-        submission = schemas.ProofSubmission(
-            content=item.content,
-            text=item.text,
-            filename=item.filename,
-            mime_type=item.mime_type,
-            metadata=item.metadata,
-            key_password=payload.key_password,
-        )
+    remaining = api_key.quota
+    if remaining <= 0:
+        raise HTTPException(status_code=status.HTTP_402_PAYMENT_REQUIRED, detail="API quota exceeded")
+
+    # Items beyond the remaining quota are rejected without being decoded,
+    # hashed or signed. Batch items carry every submission field except the
+    # shared key password, so they are used as they are.
+    items = payload.items[:remaining]
+    over_quota = len(payload.items) - len(items)
+    decoded: list[tuple[ProofContent, str | None] | HTTPException] = []
+    for item in items:
         try:
-            proof_response = api_register_proof(submission, api_key, current_user, db)
-            results.append(schemas.BatchProofResult(success=True, proof=proof_response))
+            decoded.append(_decode_payload(item))
         except HTTPException as exc:
-            results.append(
-                schemas.BatchProofResult(
-                    success=False,
-                    error=str(exc.detail),
-                )
+            decoded.append(exc)
+
+    # Hash every payload up front so independent digests run in parallel.
+    pending = [entry[0] for entry in decoded if not isinstance(entry, HTTPException)]
+    for content, file_hash in zip(pending, hash_many([content.data or b"" for content in pending])):
+        content.file_hash = file_hash
+
+    # One lookup covers every duplicate check; hashes repeated inside the
+    # batch are caught by ``seen``.
+    existing = set(
+        db.scalars(
+            select(models.Proof.file_hash).where(
+                models.Proof.file_hash.in_({content.file_hash for content in pending})
             )
-    db.add(
-        models.UsageLog(
-            user_id=current_user.id,
-            action="public_api.batch",
-            metadata_json={"items": len(payload.items)},
         )
     )
-    db.commit()
-    return schemas.BatchProofResponsePayload(results=results)
+
+    # Every item is signed with the same key, so Argon2 runs once per batch
+    # rather than once per item.
+    private_key: bytes | None = None
+    key_error: str | None = None
+    if pending:
+        try:
+            private_key = registration_service.unlock_private_key(current_user, payload.key_password)
+        except ValueError as exc:
+            key_error = str(exc)
+
+    # Registrations from the first pass, by item position. A retry adds their
+    # rows again instead of re-signing, re-storing and re-anchoring them.
+    prepared: dict[int, ProofCreationResult] = {}
+
+    def register_items(isolate: bool) -> tuple[list[_BatchEntry], list[ProofCreationResult | str]]:
+        seen = set(existing)
+        registered: list[_BatchEntry] = []
+        outcomes: list[ProofCreationResult | str] = []
+        for position, (item, entry) in enumerate(zip(items, decoded)):
+            if isinstance(entry, HTTPException):
+                outcomes.append(str(entry.detail))
+                continue
+            content, text_payload = entry
+            if content.file_hash in seen:
+                outcomes.append("Proof already exists")
+                continue
+            if key_error is not None:
+                outcomes.append(key_error)
+                continue
+            try:
+                with db.begin_nested() if isolate else nullcontext():
+                    result = prepared.get(position)
+                    if result is not None:
+                        registration_service.restore(db, current_user, result)
+                    else:
+                        result = registration_service.register_content(
+                            db,
+                            current_user,
+                            content,
+                            _encode_metadata(item),
+                            payload.key_password,
+                            text_payload=text_payload,
+                            defer_similarity=True,
+                            commit=False,
+                            check_duplicate=False,
+                            private_key=private_key,
+                        )
+                        prepared[position] = result
+            except ValueError as exc:
+                outcomes.append(str(exc))
+                continue
+            except IntegrityError:
+                if not isolate:
+                    raise
+                # Only the hash is unique among the rows an item adds.
+                outcomes.append("Proof already exists")
+                continue
+            seen.add(content.file_hash)
+            registered.append((result, content, text_payload))
+            outcomes.append(result)
+        outcomes.extend(["API quota exceeded"] * over_quota)
+        _record_batch_usage(db, api_key, current_user, registered, len(payload.items))
+        return registered, outcomes
+
+    # Registration only adds rows to the session and raises before adding
+    # anything, so the whole batch is normally flushed together at commit:
+    # one multi-row INSERT per table instead of a flush per item.
+    try:
+        registered, outcomes = register_items(isolate=False)
+        db.commit()
+    except IntegrityError:
+        # Another request committed one of these hashes meanwhile. Add the
+        # batch again with a SAVEPOINT per item so only the colliding items
+        # fail; their stored files are left unreferenced.
+        db.rollback()
+        logger.info("batch_register_retry_isolated", items=len(items))
+        registered, outcomes = register_items(isolate=True)
+        db.commit()
+
+    for result, _, _ in registered:
+        background.add_task(registration_service.publish, result)
+    background.add_task(
+        _index_batch_similarity,
+        [(result.proof.id, content, text_payload) for result, content, text_payload in registered],
+    )
+
+    results = [
+        schemas.BatchProofResult.model_construct(success=True, proof=_build_response(outcome), error=None)
+        if isinstance(outcome, ProofCreationResult)
+        else schemas.BatchProofResult.model_construct(success=False, proof=None, error=outcome)
+        for outcome in outcomes
+    ]
+    return schemas.BatchProofResponsePayload.model_construct(results=results)
 
 
 @router.get("/usage", response_model=schemas.UsageResponse)
-def api_usage(
+async def api_usage(
     current_user: models.User = Depends(get_api_key_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> schemas.UsageResponse:
-    proofs_generated = db.query(models.Proof).filter(models.Proof.user_id == current_user.id).count()
-    verifications = (
-        db.query(models.Verification)
-        .join(models.Proof, models.Proof.id == models.Verification.proof_id)
-        .filter(models.Proof.user_id == current_user.id)
-        .count()
-    )
-    last_payment = (
-        db.query(models.Payment)
-        .filter(models.Payment.user_id == current_user.id)
-        .order_by(models.Payment.created_at.desc())
-        .first()
-    )
-    next_batch = (
-        db.query(models.AnchorBatch)
-        .join(models.Proof, models.Proof.anchor_batch_id == models.AnchorBatch.id)
-        .filter(models.Proof.user_id == current_user.id)
-        .filter(models.AnchorBatch.status == "pending")
-        .order_by(models.AnchorBatch.created_at.asc())
-        .first()
-    )
+    user_id = current_user.id
+    # All four figures come back from one round trip as scalar subqueries.
+    usage = (
+        await db.execute(
+            select(
+                select(func.count(models.Proof.id))
+                .where(models.Proof.user_id == user_id)
+                .scalar_subquery()
+                .label("proofs_generated"),
+                select(func.count(models.Verification.id))
+                .select_from(models.Verification)
+                .join(models.Proof, models.Proof.id == models.Verification.proof_id)
+                .where(models.Proof.user_id == user_id)
+                .scalar_subquery()
+                .label("verifications"),
+                select(func.max(models.Payment.created_at))
+                .where(models.Payment.user_id == user_id)
+                .scalar_subquery()
+                .label("last_payment"),
+                select(func.min(models.AnchorBatch.created_at))
+                .select_from(models.AnchorBatch)
+                .join(models.Proof, models.Proof.anchor_batch_id == models.AnchorBatch.id)
+                .where(models.Proof.user_id == user_id, models.AnchorBatch.status == "pending")
+                .scalar_subquery()
+                .label("next_anchor_batch"),
+            )
+        )
+    ).one()
     plan_details = get_plan_details(current_user.subscription_plan)
-    return schemas.UsageResponse(
-        proofs_generated=proofs_generated,
-        verifications_performed=verifications,
+    return schemas.UsageResponse.model_construct(
+        proofs_generated=usage.proofs_generated,
+        verifications_performed=usage.verifications,
         remaining_credits=current_user.credits,
-        last_payment=last_payment.created_at if last_payment else None,
-        next_anchor_batch=next_batch.created_at if next_batch else None,
+        last_payment=usage.last_payment,
+        next_anchor_batch=usage.next_anchor_batch,
         plan=plan_details.name,
         rate_limit_per_minute=plan_details.per_minute,
         monthly_quota=plan_details.monthly_quota,
@@ -1,97 +1,104 @@
 """Public verification endpoints returning shareable proof status."""
 from __future__ import annotations
 
-from io import BytesIO
-
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from prooforigin.api import schemas
-from prooforigin.api.dependencies.database import get_db
-from prooforigin.core import models
+from prooforigin.api.caching import etag_matches, hash_etag, http_date
+from prooforigin.api.dependencies.database import get_async_db
 from prooforigin.core.logging import get_logger
-from prooforigin.services.certificates import build_certificate
+from prooforigin.services.audit import get_audit_writer
+from prooforigin.services.certificates import get_certificate
+from prooforigin.services.proofs import ProofRegistrationService
 from prooforigin.services.webhooks import queue_event
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/verify", tags=["public-verify"])
+registration_service = ProofRegistrationService()
+audit_writer = get_audit_writer()
+
+# Every field of a negative lookup except the hash is constant and known to be valid.
+_MISSING_STATUS = {
+    "status": "missing",
+    "created_at": None,
+    "owner": None,
+    "download_url": None,
+    "blockchain_tx": None,
+    "anchored": False,
+    "proof_id": None,
+}
 
 
 @router.get("/{file_hash}", response_model=schemas.PublicProofStatus)
-def public_verify(
+async def public_verify(
     file_hash: str,
     request: Request,
-    db: Session = Depends(get_db),
+    background: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
 ) -> schemas.PublicProofStatus:
-    proof = db.query(models.Proof).filter(models.Proof.file_hash == file_hash).first()
+    proof = await registration_service.lookup_hash_async(db, file_hash)
     requester_ip = request.client.host if request.client else None
 
-    verification = models.Verification(
-        proof_id=proof.id if proof else None,
-        hash=file_hash,
-        success=bool(proof),
-        requester_ip=requester_ip,
-    )
-    db.add(verification)
+    audit_writer.verification(file_hash, proof.proof_id if proof else None, bool(proof), requester_ip)
 
     if not proof:
-        db.commit()
-        return schemas.PublicProofStatus(
-            hash=file_hash,
-            status="missing",
-            created_at=None,
-            owner=None,
-            download_url=None,
-            blockchain_tx=None,
-            anchored=False,
-            proof_id=None,
-        )
-
-    owner = proof.user
-    db.commit()
-    queue_event(
-        owner.id,
+        return schemas.PublicProofStatus.model_construct(hash=file_hash, **_MISSING_STATUS)
+
+    background.add_task(
+        queue_event,
+        proof.user_id,
         "proof.verified.public",
         {
-            "proof_id": str(proof.id),
+            "proof_id": str(proof.proof_id),
             "hash": proof.file_hash,
             "requester_ip": requester_ip,
         },
     )
 
-    return schemas.PublicProofStatus(
+    return schemas.PublicProofStatus.model_construct(
         hash=proof.file_hash,
         status="verified",
         created_at=proof.created_at,
         owner={
-            "id": str(owner.id),
-            "email": owner.email,
-            "display_name": owner.display_name,
+            "id": str(proof.user_id),
+            "email": proof.owner_email,
+            "display_name": proof.owner_display_name,
         },
         download_url=f"/verify/{proof.file_hash}/certificate",
         blockchain_tx=proof.blockchain_tx,
         anchored=bool(proof.blockchain_tx),
-        proof_id=proof.id,
+        proof_id=proof.proof_id,
     )
 
 
 @router.get("/{file_hash}/certificate")
-def public_certificate(
+async def public_certificate(
     file_hash: str,
-    db: Session = Depends(get_db),
-) -> StreamingResponse:
-    proof = db.query(models.Proof).filter(models.Proof.file_hash == file_hash).first()
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    proof, owner = await registration_service.verify_hash_async(db, file_hash)
     if not proof:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Proof not found")
 
-    pdf_bytes = build_certificate(proof, proof.user)
-    return StreamingResponse(
-        BytesIO(pdf_bytes),
-        media_type="application/pdf",
-        headers={"Content-Disposition": f'attachment; filename="proof-{proof.id}.pdf"'},
-    )
+    anchored = bool(proof.blockchain_tx)
+    headers = {
+        "Content-Disposition": f'attachment; filename="proof-{proof.id}.pdf"',
+        "ETag": hash_etag(proof.file_hash, anchored),
+        "Last-Modified": http_date(proof.anchored_at or proof.created_at),
+        "Cache-Control": "public, max-age=300, immutable" if anchored else "public, max-age=300",
+    }
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Rendered once per anchor state and then served from storage; the
+    # render or fetch runs off the event loop.
+    pdf_bytes = await run_in_threadpool(get_certificate, proof, owner)
+    return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
 
 
 __all__ = ["router"]
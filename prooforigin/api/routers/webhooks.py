@@ -23,7 +23,7 @@ def list_webhooks(
         .all()
     )
     return [
-        schemas.WebhookSubscriptionResponse(
+        schemas.WebhookSubscriptionResponse.model_construct(
             id=sub.id,
             target_url=sub.target_url,
             event=sub.event,
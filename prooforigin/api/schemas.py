@@ -38,6 +38,14 @@ class UserProfile(BaseModel):
     created_at: datetime
     subscription_plan: str
 
+    @classmethod
+    def from_orm_trusted(cls, user: Any) -> "UserProfile":
+        """Build the profile from a ``User`` row without re-validating its columns."""
+        return cls.model_construct(
+            _fields_set=None,
+            **{name: getattr(user, name) for name in cls.model_fields},
+        )
+
 
 class ProofMetadata(BaseModel):
     title: str
@@ -68,6 +76,7 @@ class ProofListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
 
 
 class VerifyRequest(BaseModel):
@@ -2,10 +2,12 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Generator
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from .settings import get_settings
 
@@ -14,35 +16,136 @@ class Base(DeclarativeBase):
     """Base declarative class for all ORM models."""
 
 
-settings = get_settings()
+_engine: Engine | None = None
+_session_factory: sessionmaker[Session] | None = None
+
+
+def _pool_options(url: str) -> dict[str, Any]:
+    # SQLite picks its own pool class; server databases get a pool sized for
+    # concurrent requests instead of the 5 + 10 QueuePool default. The sync
+    # and async engines each take half of the configured budget, so a process
+    # never holds more than pool_size + max_overflow connections. LIFO hands
+    # out the most recently used connection, so idle ones can age out.
+    if url.startswith("sqlite"):
+        return {}
+    settings = get_settings()
+    return {
+        "pool_size": max(1, settings.database_pool_size // 2),
+        "max_overflow": settings.database_max_overflow // 2,
+        "pool_recycle": settings.database_pool_recycle,
+        "pool_use_lifo": True,
+    }
+
+
+# Pooled SQLite connections live for the whole process, so a larger
+# prepared-statement cache keeps every hot query compiled.
+_SQLITE_CONNECT_ARGS = {"cached_statements": 256}
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
 
-connect_args = {"check_same_thread": False} if settings.resolved_database_url.startswith("sqlite") else {}
 
-_engine = create_engine(
-    settings.resolved_database_url,
-    echo=False,
-    future=True,
-    pool_pre_ping=True,
-    connect_args=connect_args,
-)
-SessionLocal = sessionmaker(bind=_engine, autoflush=False, autocommit=False, expire_on_commit=False)
+def _tune_sqlite(engine: Engine) -> None:
+    """Apply the SQLite settings every new connection should run with.
+
+    WAL lets readers proceed during writes, and NORMAL sync drops the fsync
+    per commit that the default journal mode pays.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection: Any, _record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in _SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def get_engine() -> Engine:
+    global _engine
+    if _engine is None:
+        url = get_settings().resolved_database_url
+        _engine = create_engine(
+            url,
+            echo=False,
+            future=True,
+            pool_pre_ping=True,
+            connect_args={"check_same_thread": False, **_SQLITE_CONNECT_ARGS} if url.startswith("sqlite") else {},
+            **_pool_options(url),
+        )
+        if url.startswith("sqlite"):
+            _tune_sqlite(_engine)
+    return _engine
+
+
+def get_sessionmaker() -> sessionmaker[Session]:
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = sessionmaker(
+            bind=get_engine(),
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False,
+        )
+    return _session_factory
+
+
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+def _async_database_url(url: str) -> str:
+    """Map the configured sync driver onto its asyncio counterpart."""
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None or parsed.drivername == driver:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
 
 
 def init_database() -> None:
     """Create database tables for the current metadata."""
     import prooforigin.core.models  # noqa: F401 ensures models are registered
 
-    Base.metadata.create_all(bind=_engine)
+    Base.metadata.create_all(bind=get_engine())
 
 
-def get_engine():
-    return _engine
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        url = get_settings().resolved_database_url
+        _async_engine = create_async_engine(
+            _async_database_url(url),
+            echo=False,
+            pool_pre_ping=True,
+            connect_args=dict(_SQLITE_CONNECT_ARGS) if url.startswith("sqlite") else {},
+            **_pool_options(url),
+        )
+        if url.startswith("sqlite"):
+            _tune_sqlite(_async_engine.sync_engine)
+    return _async_engine
+
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(),
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_session_factory
 
 
 @contextmanager
 def session_scope() -> Generator:
     """Provide a transactional scope around a series of operations."""
-    session = SessionLocal()
+    session = get_sessionmaker()()
     try:
         yield session
         session.commit()
@@ -53,4 +156,12 @@ def session_scope() -> Generator:
         session.close()
 
 
-__all__ = ["Base", "SessionLocal", "init_database", "session_scope", "get_engine"]
+__all__ = [
+    "Base",
+    "get_sessionmaker",
+    "init_database",
+    "session_scope",
+    "get_engine",
+    "get_async_engine",
+    "get_async_sessionmaker",
+]
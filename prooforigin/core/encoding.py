@@ -0,0 +1,23 @@
+"""Binary-to-text decoding helpers for API payloads."""
+from __future__ import annotations
+
+import binascii
+
+try:  # Optional dependency: SIMD base64 codec
+    import pybase64
+except ImportError:  # pragma: no cover - optional
+    pybase64 = None  # type: ignore
+
+
+def decode_base64(value: str | bytes) -> bytes:
+    """Decode base64 content, using the SIMD codec when it is installed.
+
+    Non-alphabet characters are discarded, matching ``base64.b64decode``'s
+    default behaviour.
+    """
+    if pybase64 is not None:
+        return pybase64.b64decode(value, validate=False)
+    return binascii.a2b_base64(value)
+
+
+__all__ = ["decode_base64"]
@@ -0,0 +1,73 @@
+"""SHA-256 helpers for content hashing."""
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+_hash_pool: ThreadPoolExecutor | None = None
+# Files at least this large are memory-mapped and hashed in one call.
+_MMAP_THRESHOLD = 1 << 20
+
+
+def new_sha256(data: bytes = b"") -> Any:
+    """Return an incremental SHA-256 hasher."""
+    return hashlib.sha256(data)
+
+
+def sha256_hex(chunks: Iterable[bytes]) -> str:
+    """Hash an iterable of byte chunks and return the hex digest."""
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sha256_file(path: Path, buffer_size: int = 1 << 20) -> str:
+    """Hash a file on disk without holding it in memory."""
+    with path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size >= _MMAP_THRESHOLD:
+            # One update over the mapped pages: no userspace copy and a single
+            # call into OpenSSL with the GIL released.
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return hashlib.sha256(mapped).hexdigest()
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+: reads straight into the digest with the GIL released.
+            return hashlib.file_digest(handle, hashlib.sha256).hexdigest()
+        digest = hashlib.sha256()
+        buffer = bytearray(buffer_size)
+        view = memoryview(buffer)
+        while read := handle.readinto(buffer):
+            digest.update(view[:read])
+        return digest.hexdigest()
+
+
+def _digest(buffer: bytes) -> str:
+    return hashlib.sha256(buffer).hexdigest()
+
+
+def _get_hash_pool() -> ThreadPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ThreadPoolExecutor(
+            max_workers=min(8, os.cpu_count() or 1),
+            thread_name_prefix="sha256",
+        )
+    return _hash_pool
+
+
+def hash_many(buffers: Sequence[bytes]) -> list[str]:
+    """Hash independent buffers across worker threads, preserving order.
+
+    hashlib releases the GIL while digesting large buffers, so batches are
+    spread over a small shared pool instead of being hashed one by one.
+    """
+    if len(buffers) < 2:
+        return [_digest(buffer) for buffer in buffers]
+    return list(_get_hash_pool().map(_digest, buffers))
+
+
+__all__ = ["hash_many", "new_sha256", "sha256_file", "sha256_hex"]
@@ -4,9 +4,15 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+import orjson
 import structlog
 
 
+def _dumps(event_dict: dict[str, Any], **kwargs: Any) -> str:
+    # structlog passes its fallback for unknown types as ``default``.
+    return orjson.dumps(event_dict, default=kwargs.get("default"), option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 def setup_logging(level: int = logging.INFO) -> None:
     logging.basicConfig(level=level, format="%(message)s")
     structlog.configure(
@@ -14,7 +20,7 @@ def setup_logging(level: int = logging.INFO) -> None:
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.processors.add_log_level,
             structlog.processors.dict_tracebacks,
-            structlog.processors.JSONRenderer(),
+            structlog.processors.JSONRenderer(serializer=_dumps),
         ],
         wrapper_class=structlog.make_filtering_bound_logger(level),
         cache_logger_on_first_use=True,
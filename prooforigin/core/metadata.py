@@ -4,10 +4,15 @@ from __future__ import annotations
 import json
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from jsonschema import Draft202012Validator, ValidationError
 
+try:  # Optional dependency, compiles the schema into plain Python code
+    import fastjsonschema  # type: ignore
+except ImportError:  # pragma: no cover - optional
+    fastjsonschema = None  # type: ignore
+
 from prooforigin.core.logging import get_logger
 from prooforigin.core.settings import get_settings
 
@@ -37,8 +42,8 @@ DEFAULT_SCHEMA = {
 }
 
 
-@lru_cache()
-def _load_schema() -> Draft202012Validator:
+@lru_cache(maxsize=1)
+def _load_schema() -> tuple[Draft202012Validator, Callable[[Any], Any] | None]:
     settings = get_settings()
     schema_path = settings.metadata_schema_path
     schema: dict[str, Any] = DEFAULT_SCHEMA
@@ -47,11 +52,33 @@ def _load_schema() -> Draft202012Validator:
             schema = json.loads(Path(schema_path).read_text())
         except Exception as exc:  # pragma: no cover - IO
             logger.warning("metadata_schema_failed", error=str(exc))
-    return Draft202012Validator(schema)
+    compiled = None
+    if fastjsonschema is not None:
+        try:
+            # jsonschema does not check "format" without a format checker and
+            # must not fill in defaults; keep the compiled variant equivalent.
+            compiled = fastjsonschema.compile(schema, use_default=False, use_formats=False)
+        except Exception as exc:  # pragma: no cover - unsupported schema
+            logger.warning("metadata_schema_compile_failed", error=str(exc))
+    return Draft202012Validator(schema), compiled
+
+
+def preload_metadata_schema() -> None:
+    """Build (and compile) the metadata validator ahead of the first upload."""
+    _load_schema()
 
 
 def validate_metadata(payload: dict[str, Any]) -> dict[str, Any]:
-    validator = _load_schema()
+    validator, compiled = _load_schema()
+    # Valid payloads are the common case; only collect errors to report them.
+    if compiled is not None:
+        try:
+            compiled(payload)
+            return payload
+        except fastjsonschema.JsonSchemaException:
+            pass
+    elif validator.is_valid(payload):
+        return payload
     errors = sorted(validator.iter_errors(payload), key=lambda e: e.path)
     if errors:
         messages = [f"{'.'.join(map(str, err.path)) or '<root>'}: {err.message}" for err in errors]
@@ -61,5 +88,5 @@ def validate_metadata(payload: dict[str, Any]) -> dict[str, Any]:
     return payload
 
 
-__all__ = ["validate_metadata"]
+__all__ = ["preload_metadata_schema", "validate_metadata"]
 
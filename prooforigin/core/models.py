@@ -5,16 +5,19 @@ import uuid
 from datetime import datetime
 from typing import Any, Optional
 
+import numpy as np
 from sqlalchemy import (
     JSON,
     Boolean,
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     LargeBinary,
     String,
     Text,
+    TypeDecorator,
     UniqueConstraint,
 )
 from sqlalchemy.dialects.postgresql import JSONB
@@ -25,6 +28,27 @@ from .database import Base
 
 JSONType = JSONB().with_variant(JSON(), "sqlite")
 
+# Embeddings are stored as packed little-endian float32, which is what the
+# similarity code computes in anyway.
+VECTOR_DTYPE = np.dtype("<f4")
+
+
+class PackedVector(TypeDecorator):
+    """Float vector persisted as raw ``float32`` bytes instead of a JSON array."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect: Any) -> bytes | None:
+        if value is None:
+            return None
+        return np.asarray(value, dtype=VECTOR_DTYPE).tobytes()
+
+    def process_result_value(self, value: Any, dialect: Any) -> list[float] | None:
+        if value is None:
+            return None
+        return np.frombuffer(value, dtype=VECTOR_DTYPE).tolist()
+
 
 class User(Base):
     __tablename__ = "users"
@@ -63,6 +87,7 @@ class User(Base):
 
 class Proof(Base):
     __tablename__ = "proofs"
+    __table_args__ = (Index("ix_proofs_user_created", "user_id", "created_at"),)
 
     id: Mapped[uuid.UUID] = mapped_column(default=uuid.uuid4, primary_key=True)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
@@ -74,8 +99,8 @@ class Proof(Base):
     file_size: Mapped[int | None]
     phash: Mapped[str | None]
     dhash: Mapped[str | None]
-    text_embedding: Mapped[list[float] | None] = mapped_column(JSONType)
-    image_embedding: Mapped[list[float] | None] = mapped_column(JSONType)
+    text_embedding: Mapped[list[float] | None] = mapped_column(PackedVector)
+    image_embedding: Mapped[list[float] | None] = mapped_column(PackedVector)
     anchored_at: Mapped[datetime | None]
     blockchain_tx: Mapped[str | None]
     anchor_signature: Mapped[str | None]
@@ -84,7 +109,10 @@ class Proof(Base):
     user: Mapped["User"] = relationship(back_populates="proofs")
     files: Mapped[list["ProofFile"]] = relationship(back_populates="proof", cascade="all,delete")
     matches: Mapped[list["SimilarityMatch"]] = relationship(
-        back_populates="proof", cascade="all,delete", foreign_keys="SimilarityMatch.proof_id"
+        back_populates="proof",
+        cascade="all,delete",
+        foreign_keys="SimilarityMatch.proof_id",
+        order_by="SimilarityMatch.score.desc()",
     )
     alerts: Mapped[list["Alert"]] = relationship(back_populates="proof", cascade="all,delete")
     anchor_batch_id: Mapped[uuid.UUID | None] = mapped_column(
@@ -117,7 +145,7 @@ class Verification(Base):
     __tablename__ = "verifications"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    proof_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("proofs.id"))
+    proof_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("proofs.id"), index=True)
     hash: Mapped[str] = mapped_column(String(128), index=True, nullable=False)
     success: Mapped[bool] = mapped_column(Boolean, default=False)
     requester_ip: Mapped[str | None] = mapped_column(String(128))
@@ -129,7 +157,10 @@ class Verification(Base):
 
 class SimilarityMatch(Base):
     __tablename__ = "similarity_matches"
-    __table_args__ = (UniqueConstraint("proof_id", "matched_proof_id", name="uniq_match"),)
+    __table_args__ = (
+        UniqueConstraint("proof_id", "matched_proof_id", name="uniq_match"),
+        Index("ix_similarity_matches_proof_score", "proof_id", "score"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     proof_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("proofs.id"), nullable=False)
@@ -150,10 +181,11 @@ class SimilarityMatch(Base):
 
 class SimilarityIndex(Base):
     __tablename__ = "similarity_index"
+    __table_args__ = (Index("ix_similarity_index_type_proof", "vector_type", "proof_id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     proof_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("proofs.id"), nullable=False, index=True)
-    vector: Mapped[list[float]] = mapped_column(JSONType, nullable=False)
+    vector: Mapped[list[float]] = mapped_column(PackedVector, nullable=False)
     vector_type: Mapped[str] = mapped_column(String(16), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
@@ -188,6 +220,7 @@ class Payment(Base):
 
 class UsageLog(Base):
     __tablename__ = "usage_logs"
+    __table_args__ = (Index("ix_usage_logs_user_created", "user_id", "created_at"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -299,6 +332,7 @@ class WebhookDelivery(Base):
 
 class AnchorBatch(Base):
     __tablename__ = "anchor_batches"
+    __table_args__ = (Index("ix_anchor_batches_status_created", "status", "created_at"),)
 
     id: Mapped[uuid.UUID] = mapped_column(default=uuid.uuid4, primary_key=True)
     merkle_root: Mapped[str] = mapped_column(String(128), unique=True)
@@ -339,4 +373,6 @@ __all__ = [
     "KeyRevocation",
     "WebhookSubscription",
     "WebhookDelivery",
+    "PackedVector",
+    "VECTOR_DTYPE",
 ]
@@ -22,10 +22,16 @@ _PLAN_REGISTRY: dict[PlanName, PlanDetails] = {
 }
 
 
+_DEFAULT_PLAN = _PLAN_REGISTRY["free"]
+
+
 def get_plan_details(plan: str | None) -> PlanDetails:
     """Return plan details defaulting to the free tier."""
-    key = (plan or "free").lower()
-    return _PLAN_REGISTRY.get(key, _PLAN_REGISTRY["free"])
+    # Plans are stored lowercase, so the direct lookup nearly always hits.
+    details = _PLAN_REGISTRY.get(plan)  # type: ignore[arg-type]
+    if details is not None:
+        return details
+    return _PLAN_REGISTRY.get((plan or "free").lower(), _DEFAULT_PLAN)  # type: ignore[arg-type]
 
 
 __all__ = ["PlanDetails", "PlanName", "get_plan_details"]
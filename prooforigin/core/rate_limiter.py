@@ -7,7 +7,7 @@ from slowapi.middleware import SlowAPIMiddleware
 from slowapi.util import get_remote_address
 
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from prooforigin.core.settings import get_settings
 
@@ -24,6 +24,9 @@ def get_limiter() -> Limiter:
                 f"{settings.rate_limit_requests}/{settings.rate_limit_window_seconds} seconds"
             ],
             storage_uri=settings.resolved_rate_limit_storage,
+            # Keep limiting per process instead of failing requests if the
+            # shared storage becomes unreachable.
+            in_memory_fallback_enabled=True,
         )
     return _limiter
 
@@ -35,8 +38,8 @@ def setup_rate_limiting(app: FastAPI) -> None:
     app.add_middleware(SlowAPIMiddleware)
 
 
-def _rate_limit_handler(request: Request, exc: RateLimitExceeded) -> JSONResponse:
-    return JSONResponse(
+def _rate_limit_handler(request: Request, exc: RateLimitExceeded) -> ORJSONResponse:
+    return ORJSONResponse(
         status_code=429,
         content={
             "detail": "Too many requests",
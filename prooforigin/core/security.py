@@ -3,9 +3,13 @@ from __future__ import annotations
 
 import base64
 import os
-import uuid
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any, Dict, Iterable
 
 import jwt
 from argon2 import PasswordHasher
@@ -14,40 +18,72 @@ from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.asymmetric import ed25519
 
+try:  # Optional dependency; libsodium releases the GIL while verifying
+    from nacl.bindings import crypto_sign_open
+except ImportError:  # pragma: no cover - optional
+    crypto_sign_open = None  # type: ignore
+
 from .settings import get_settings
 
-_hasher = PasswordHasher()
 _settings = get_settings()
+_hasher = PasswordHasher(
+    time_cost=_settings.password_time_cost,
+    memory_cost=_settings.password_memory_cost,
+    parallelism=_settings.password_parallelism,
+    type=Type.ID,
+)
+# Each Argon2 run allocates memory_cost KiB; cap how many run at once so a
+# burst of logins cannot exhaust memory.
+_argon2_slots = threading.BoundedSemaphore(
+    max(1, _settings.password_memory_budget // _settings.password_memory_cost)
+)
 
 
 def hash_password(password: str) -> str:
-    return _hasher.hash(password)
+    with _argon2_slots:
+        return _hasher.hash(password)
 
 
 def verify_password(password: str, hashed: str) -> bool:
     try:
-        return _hasher.verify(hashed, password)
+        with _argon2_slots:
+            return _hasher.verify(hashed, password)
     except Exception:
         return False
 
 
+@lru_cache(maxsize=1)
+def _master_key_int() -> int:
+    # Only the first 32 bytes take part, as with the byte-wise XOR this
+    # replaced; a longer key (a non-ASCII development secret, say) must not
+    # overflow the 256-bit result.
+    return int.from_bytes(_settings.resolved_master_key[:32], "little")
+
+
+def reset_master_key_cache() -> None:
+    """Forget the resolved master key, e.g. after overriding it in development."""
+    _settings.__dict__.pop("resolved_master_key", None)
+    _master_key_int.cache_clear()
+
+
 def _derive_key_material(password: str, salt: bytes) -> bytes:
-    return hash_secret_raw(
-        secret=password.encode(),
-        salt=salt,
-        time_cost=_settings.password_time_cost,
-        memory_cost=_settings.password_memory_cost,
-        parallelism=_settings.password_parallelism,
-        hash_len=32,
-        type=Type.ID,
-    )
+    with _argon2_slots:
+        return hash_secret_raw(
+            secret=password.encode(),
+            salt=salt,
+            time_cost=_settings.password_time_cost,
+            memory_cost=_settings.password_memory_cost,
+            parallelism=_settings.password_parallelism,
+            hash_len=32,
+            type=Type.ID,
+        )
 
 
 def _derive_encryption_key(password: str, salt: bytes) -> bytes:
     key_material = _derive_key_material(password, salt)
-    master = _settings.resolved_master_key
-    # XOR the key material with the master key for a simple combination
-    return bytes(a ^ b for a, b in zip(key_material, master))
+    # XOR the key material with the master key for a simple combination,
+    # as one 256-bit integer operation rather than byte by byte.
+    return (int.from_bytes(key_material, "little") ^ _master_key_int()).to_bytes(32, "little")
 
 
 def encrypt_private_key(private_key: bytes, password: str) -> tuple[bytes, bytes, bytes]:
@@ -89,8 +125,14 @@ def derive_public_key(private_key_bytes: bytes) -> bytes:
     )
 
 
+@lru_cache(maxsize=1024)
+def _load_public_key(public_key_bytes: bytes) -> ed25519.Ed25519PublicKey:
+    # Public keys are shared by every proof of an author; parse each once.
+    return ed25519.Ed25519PublicKey.from_public_bytes(public_key_bytes)
+
+
 def public_key_pem(public_key_bytes: bytes) -> str:
-    public_key = ed25519.Ed25519PublicKey.from_public_bytes(public_key_bytes)
+    public_key = _load_public_key(bytes(public_key_bytes))
     return (
         public_key.public_bytes(
             encoding=serialization.Encoding.PEM,
@@ -106,7 +148,7 @@ def sign_hash(hash_value: str, private_key_bytes: bytes) -> str:
 
 
 def verify_signature(hash_value: str, signature: str, public_key_bytes: bytes) -> bool:
-    public_key = ed25519.Ed25519PublicKey.from_public_bytes(public_key_bytes)
+    public_key = _load_public_key(bytes(public_key_bytes))
     try:
         public_key.verify(base64.b64decode(signature), bytes.fromhex(hash_value))
         return True
@@ -114,16 +156,79 @@ def verify_signature(hash_value: str, signature: str, public_key_bytes: bytes) -
         return False
 
 
+@lru_cache(maxsize=65536)
+def _verify_signature_cached(hash_value: str, signature: str, public_key_bytes: bytes) -> bool:
+    return verify_signature(hash_value, signature, public_key_bytes)
+
+
+def verify_signature_cached(hash_value: str, signature: str, public_key_bytes: bytes) -> bool:
+    """Memoised :func:`verify_signature`; the result depends only on its inputs."""
+    return _verify_signature_cached(hash_value, signature, bytes(public_key_bytes))
+
+
+_PARALLEL_VERIFY_MIN = 64
+_verify_pool: ThreadPoolExecutor | None = None
+
+
+def _get_verify_pool() -> ThreadPoolExecutor:
+    global _verify_pool
+    if _verify_pool is None:
+        _verify_pool = ThreadPoolExecutor(
+            max_workers=min(8, os.cpu_count() or 1),
+            thread_name_prefix="ed25519",
+        )
+    return _verify_pool
+
+
+def _verify_sodium(item: tuple[str, str, bytes | None]) -> bool:
+    hash_value, signature, public_key_bytes = item
+    try:
+        crypto_sign_open(base64.b64decode(signature) + bytes.fromhex(hash_value), bytes(public_key_bytes or b""))
+        return True
+    except Exception:
+        return False
+
+
+def verify_batch(items: Iterable[tuple[str, str, bytes | None]]) -> list[bool]:
+    """Verify ``(hash, signature, public_key)`` triples, parsing each key once.
+
+    With PyNaCl installed, large batches are verified by libsodium across a
+    small thread pool, since it releases the GIL for each verification.
+    """
+    items = list(items)
+    if crypto_sign_open is not None and len(items) >= _PARALLEL_VERIFY_MIN:
+        return list(_get_verify_pool().map(_verify_sodium, items, chunksize=32))
+    keys: dict[bytes, ed25519.Ed25519PublicKey | None] = {}
+    results: list[bool] = []
+    for hash_value, signature, public_key_bytes in items:
+        raw = bytes(public_key_bytes or b"")
+        if raw not in keys:
+            try:
+                keys[raw] = _load_public_key(raw)
+            except ValueError:
+                keys[raw] = None
+        public_key = keys[raw]
+        if public_key is None:
+            results.append(False)
+            continue
+        try:
+            public_key.verify(base64.b64decode(signature), bytes.fromhex(hash_value))
+            results.append(True)
+        except Exception:
+            results.append(False)
+    return results
+
+
 def create_token(data: Dict[str, Any], expires_delta: timedelta, token_type: str) -> str:
-    payload = data.copy()
-    payload.update(
-        {
-            "exp": datetime.now(timezone.utc) + expires_delta,
-            "iat": datetime.now(timezone.utc),
-            "type": token_type,
-            "jti": uuid.uuid4().hex,
-        }
-    )
+    # Integer claims: PyJWT would otherwise convert each datetime itself.
+    now = int(time.time())
+    payload = {
+        **data,
+        "exp": now + int(expires_delta.total_seconds()),
+        "iat": now,
+        "type": token_type,
+        "jti": secrets.token_hex(16),
+    }
     return jwt.encode(payload, _settings.secret_key, algorithm="HS256")
 
 
@@ -137,14 +242,40 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
     return create_token(data, expires, "refresh")
 
 
+_jwt = jwt.PyJWT()
+_JWT_ALGORITHMS = ("HS256",)
+
+
+@lru_cache(maxsize=4096)
+def _verified_claims(token: str) -> dict[str, Any]:
+    # Signature and claim parsing are deterministic per token; only expiry
+    # depends on the clock, so it is checked on every call in decode_token.
+    return _jwt.decode(
+        token,
+        _settings.secret_key,
+        algorithms=_JWT_ALGORITHMS,
+        options={"verify_exp": False},
+    )
+
+
 def decode_token(token: str) -> dict[str, Any]:
-    return jwt.decode(token, _settings.secret_key, algorithms=["HS256"])
+    claims = _verified_claims(token)
+    exp = claims.get("exp")
+    if exp is not None and exp <= time.time():
+        raise jwt.ExpiredSignatureError("Signature has expired")
+    return dict(claims)
+
+
+@lru_cache(maxsize=4096)
+def _exported_public_key(public_key_bytes: bytes) -> tuple[str, str]:
+    return public_key_pem(public_key_bytes), base64.b64encode(public_key_bytes).decode()
 
 
 def export_public_key(public_key_bytes: bytes) -> dict[str, str]:
+    pem, raw = _exported_public_key(bytes(public_key_bytes))
     return {
-        "public_key_pem": public_key_pem(public_key_bytes),
-        "public_key_raw": base64.b64encode(public_key_bytes).decode(),
+        "public_key_pem": pem,
+        "public_key_raw": raw,
     }
 
 
@@ -157,8 +288,11 @@ __all__ = [
     "derive_public_key",
     "sign_hash",
     "verify_signature",
+    "verify_batch",
+    "verify_signature_cached",
     "create_access_token",
     "create_refresh_token",
     "decode_token",
+    "reset_master_key_cache",
     "export_public_key",
 ]
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import secrets
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Literal
 
@@ -22,6 +22,11 @@ class Settings(BaseSettings):
     # Database
     data_dir: Path = Field(default_factory=lambda: Path.cwd() / "instance")
     database_url: str | None = None
+    # Per-process connection budget, split evenly between the sync and async
+    # engines: at most pool_size + max_overflow (40) connections per process.
+    database_pool_size: int = 20
+    database_max_overflow: int = 20
+    database_pool_recycle: int = 3600
 
     # Security
     access_token_expire_minutes: int = 30
@@ -29,6 +34,8 @@ class Settings(BaseSettings):
     password_time_cost: int = 3
     password_memory_cost: int = 64 * 1024
     password_parallelism: int = 2
+    # KiB of memory Argon2 may use across concurrent hashes in one process.
+    password_memory_budget: int = 1024 * 1024
     private_key_master_key: str | None = None
 
     # Similarity / ML
@@ -57,6 +64,7 @@ class Settings(BaseSettings):
     storage_s3_region: str | None = None
     storage_s3_access_key: str | None = None
     storage_s3_secret_key: str | None = None
+    upload_memory_limit: int = 50 * 1024 * 1024
 
     # Blockchain anchoring
     blockchain_rpc_url: str | None = None
@@ -92,7 +100,7 @@ class Settings(BaseSettings):
     enable_prometheus: bool = True
     metrics_namespace: str = "prooforigin"
 
-    @property
+    @cached_property
     def resolved_database_url(self) -> str:
         """Return the configured database URL defaulting to a local SQLite file."""
         if self.database_url:
@@ -105,17 +113,28 @@ class Settings(BaseSettings):
     def resolved_rate_limit_storage(self) -> str:
         if self.rate_limit_storage_url:
             return self.rate_limit_storage_url
-        if self.redis_url:
+        # Only production shares counters through Redis; elsewhere the broker
+        # Redis is not worth a network hop on every request.
+        if self.redis_url and self.environment == "production":
             return f"redis://{self.redis_url.split('://')[-1]}"
         return "memory://"
 
-    @property
+    @cached_property
     def resolved_storage_path(self) -> Path:
+        # Resolved once: storage reads this on every request and the
+        # directory only needs creating the first time.
         path = self.storage_local_path
         path.mkdir(parents=True, exist_ok=True)
         return path
 
-    @property
+    @cached_property
+    def resolved_tmp_dir(self) -> Path:
+        """Scratch directory for uploads too large to keep in memory."""
+        path = self.data_dir / "tmp"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    @cached_property
     def resolved_master_key(self) -> bytes:
         """Return a 32-byte master key for private key encryption."""
         if self.private_key_master_key:
@@ -0,0 +1,154 @@
+"""Buffered writer for append-only audit rows."""
+from __future__ import annotations
+
+import threading
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+
+from prooforigin.core import models
+from prooforigin.core.database import Base, session_scope
+from prooforigin.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class AuditWriter:
+    """Collect ``Verification``/``UsageLog`` rows and insert them in batches.
+
+    Audit rows do not need to be durable before the response is sent, so
+    endpoints enqueue plain column mappings and a daemon thread writes them
+    every ``flush_interval`` seconds, or as soon as ``max_batch`` rows are
+    pending, with one bulk INSERT per model and a single commit. If the
+    database is unreachable the batch is re-queued, keeping at most
+    ``max_pending`` rows; if the batch is rejected (a constraint violation,
+    say) the rows are retried one by one and the bad ones are logged and
+    dropped so they cannot hold back the rest.
+
+    Metered usage (the ``public_api.*`` actions counted by plan limits) must
+    not go through the writer: limits are checked against committed rows.
+    """
+
+    def __init__(self, flush_interval: float = 0.1, max_batch: int = 500, max_pending: int = 50_000) -> None:
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self._pending: deque[tuple[type[Base], dict[str, Any]]] = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def enqueue(self, model: type[Base], **values: Any) -> None:
+        # Stamp rows now so created_at reflects the request, not the flush.
+        values.setdefault("created_at", datetime.utcnow())
+        with self._lock:
+            self._pending.append((model, values))
+            pending = len(self._pending)
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+        if pending >= self.max_batch:
+            self._wakeup.set()
+
+    def verification(
+        self,
+        file_hash: str,
+        proof_id: Any,
+        success: bool,
+        requester_ip: str | None,
+    ) -> None:
+        self.enqueue(
+            models.Verification,
+            proof_id=proof_id,
+            hash=file_hash,
+            success=success,
+            requester_ip=requester_ip,
+        )
+
+    def usage(self, user_id: Any, action: str, metadata: dict[str, Any] | None = None) -> None:
+        self.enqueue(models.UsageLog, user_id=user_id, action=action, metadata_json=metadata)
+
+    def flush(self) -> None:
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+        if not batch:
+            return
+        rows: dict[type[Base], list[dict[str, Any]]] = defaultdict(list)
+        for model, values in batch:
+            rows[model].append(values)
+        try:
+            with session_scope() as session:
+                for model, mappings in rows.items():
+                    session.execute(insert(model), mappings)
+        except (OperationalError, InterfaceError) as exc:
+            logger.error("audit_flush_failed", rows=len(batch), error=str(exc))
+            self._requeue(batch)
+        except DBAPIError as exc:
+            logger.warning("audit_flush_rejected", rows=len(batch), error=str(exc))
+            self._insert_each(batch)
+
+    def _insert_each(self, batch: list[tuple[type[Base], dict[str, Any]]]) -> None:
+        # Slow path after a rejected batch: one transaction per row, so a
+        # single bad row is dead-lettered to the log instead of blocking the
+        # rows around it.
+        for position, (model, values) in enumerate(batch):
+            try:
+                with session_scope() as session:
+                    session.execute(insert(model), [values])
+            except (OperationalError, InterfaceError) as exc:
+                logger.error("audit_flush_failed", rows=len(batch) - position, error=str(exc))
+                self._requeue(batch[position:])
+                return
+            except DBAPIError as exc:
+                logger.error(
+                    "audit_row_rejected",
+                    table=model.__tablename__,
+                    row={key: str(value) for key, value in values.items()},
+                    error=str(exc),
+                )
+
+    def _requeue(self, batch: list[tuple[type[Base], dict[str, Any]]]) -> None:
+        # Failed rows go back ahead of newer ones; the oldest are dropped if
+        # the database stays unavailable long enough to hit the cap.
+        with self._lock:
+            self._pending.extendleft(reversed(batch))
+            dropped = 0
+            while len(self._pending) > self.max_pending:
+                self._pending.popleft()
+                dropped += 1
+        if dropped:
+            logger.error("audit_rows_dropped", rows=dropped)
+
+    def close(self) -> None:
+        """Stop the flusher and write whatever is still pending."""
+        self._stopping.set()
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+_audit_writer: AuditWriter | None = None
+
+
+def get_audit_writer() -> AuditWriter:
+    global _audit_writer
+    if _audit_writer is None:
+        _audit_writer = AuditWriter()
+    return _audit_writer
+
+
+__all__ = ["AuditWriter", "get_audit_writer"]
@@ -18,9 +18,11 @@ except ImportError:  # pragma: no cover - optional dependency
     geth_poa_middleware = None  # type: ignore
 
 from prooforigin.core.database import session_scope
+from prooforigin.core.hashing import new_sha256
 from prooforigin.core.logging import get_logger
 from prooforigin.core.settings import get_settings
 from prooforigin.core import models
+from prooforigin.services.hashcache import get_hash_cache
 from prooforigin.services.webhooks import queue_event
 
 logger = get_logger(__name__)
@@ -28,16 +30,14 @@ settings = get_settings()
 
 
 def compute_merkle_root(leaves: list[str]) -> str:
+    # Nodes stay hex strings: anchored roots must keep reproducing exactly.
     if not leaves:
-        return hashlib.sha256(b"").hexdigest()
-    nodes = [hashlib.sha256(leaf.encode()).hexdigest() for leaf in leaves]
+        return new_sha256().hexdigest()
+    nodes = [new_sha256(leaf.encode()).hexdigest() for leaf in leaves]
     while len(nodes) > 1:
         if len(nodes) % 2 == 1:
             nodes.append(nodes[-1])
-        nodes = [
-            hashlib.sha256((nodes[i] + nodes[i + 1]).encode()).hexdigest()
-            for i in range(0, len(nodes), 2)
-        ]
+        nodes = [new_sha256((left + right).encode()).hexdigest() for left, right in zip(nodes[::2], nodes[1::2])]
     return nodes[0]
 
 
@@ -133,6 +133,7 @@ def schedule_anchor(proof_id: uuid.UUID) -> None:
         return
 
     anchor = BlockchainAnchor()
+    anchored_hashes: list[str] = []
     with session_scope() as session:
         proof = session.get(models.Proof, proof_id)
         if not proof:
@@ -156,6 +157,7 @@ def schedule_anchor(proof_id: uuid.UUID) -> None:
             batch_proof.anchor_signature = result["anchor_signature"]
             batch_proof.anchored_at = anchored_at
             session.add(batch_proof)
+            anchored_hashes.append(batch_proof.file_hash)
             queue_event(
                 batch_proof.user_id,
                 "proof.anchored",
@@ -178,6 +180,8 @@ def schedule_anchor(proof_id: uuid.UUID) -> None:
             tx=result["transaction_hash"],
             merkle_root=merkle_root,
         )
+    # Cached public lookups would otherwise report these proofs as pending.
+    get_hash_cache().invalidate(*anchored_hashes)
 
 
 __all__ = ["BlockchainAnchor", "schedule_anchor", "compute_merkle_root"]
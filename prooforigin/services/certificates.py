@@ -10,7 +10,12 @@ from reportlab.lib.units import mm
 from reportlab.pdfgen import canvas
 
 from prooforigin.core import models
+from prooforigin.core.hashing import sha256_hex
+from prooforigin.core.logging import get_logger
 from prooforigin.core.settings import get_settings
+from prooforigin.services.storage import StorageError, get_storage_service
+
+logger = get_logger(__name__)
 
 
 def build_certificate(proof: models.Proof, owner: models.User | None) -> bytes:
@@ -54,8 +59,43 @@ def build_certificate(proof: models.Proof, owner: models.User | None) -> bytes:
     pdf.showPage()
     pdf.save()
 
-    buffer.seek(0)
-    return buffer.read()
+    return buffer.getvalue()
+
+
+def certificate_key(proof: models.Proof, owner: models.User | None) -> str:
+    """Storage key of a rendered certificate.
+
+    It covers every mutable value printed on the PDF, so the key changes once
+    the proof is anchored or the owner edits their name or email.
+    """
+    state = (
+        proof.anchored_at.isoformat() if proof.anchored_at else "",
+        proof.blockchain_tx or "",
+        (owner.display_name or "") if owner else "",
+        owner.email if owner else "",
+    )
+    digest = sha256_hex(part.encode() + b"\0" for part in state)
+    return f"certificates/{proof.id}-{digest[:16]}.pdf"
+
+
+def get_certificate(proof: models.Proof, owner: models.User | None) -> bytes:
+    """Return the certificate PDF, rendering and storing it on first request."""
+    storage = get_storage_service()
+    key = certificate_key(proof, owner)
+    try:
+        cached = storage.fetch(key)
+    except StorageError as exc:
+        logger.warning("certificate_cache_read_failed", key=key, error=str(exc))
+        cached = None
+    if cached is not None:
+        return cached
+
+    pdf_bytes = build_certificate(proof, owner)
+    try:
+        storage.put(key, pdf_bytes)
+    except StorageError as exc:
+        logger.warning("certificate_cache_write_failed", key=key, error=str(exc))
+    return pdf_bytes
 
 
-__all__ = ["build_certificate"]
+__all__ = ["build_certificate", "certificate_key", "get_certificate"]
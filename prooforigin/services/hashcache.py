@@ -0,0 +1,88 @@
+"""In-process cache of public hash lookups."""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+from prooforigin.core import models
+
+
+@dataclass(slots=True, frozen=True)
+class ProofSnapshot:
+    """Immutable scalars a verification response needs about a proof and its owner."""
+
+    proof_id: uuid.UUID
+    user_id: uuid.UUID
+    file_hash: str
+    created_at: datetime
+    blockchain_tx: str | None
+    owner_email: str | None
+    owner_display_name: str | None
+
+    @classmethod
+    def from_models(cls, proof: models.Proof, owner: models.User | None) -> "ProofSnapshot":
+        return cls(
+            proof_id=proof.id,
+            user_id=proof.user_id,
+            file_hash=proof.file_hash,
+            created_at=proof.created_at,
+            blockchain_tx=proof.blockchain_tx,
+            owner_email=owner.email if owner else None,
+            owner_display_name=owner.display_name if owner else None,
+        )
+
+
+class HashLookupCache:
+    """TTL-bounded LRU of registered hashes.
+
+    Only hits are cached: a missing hash can be registered at any moment, so
+    negative lookups always go to the database. Anchoring invalidates the
+    affected hashes locally; other workers converge within ``ttl_seconds``.
+    """
+
+    def __init__(self, maxsize: int = 100_000, ttl_seconds: float = 300.0) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, ProofSnapshot]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, file_hash: str) -> ProofSnapshot | None:
+        with self._lock:
+            entry = self._entries.get(file_hash)
+            if entry is None:
+                return None
+            expires_at, snapshot = entry
+            if expires_at <= time.monotonic():
+                del self._entries[file_hash]
+                return None
+            self._entries.move_to_end(file_hash)
+            return snapshot
+
+    def put(self, snapshot: ProofSnapshot) -> None:
+        with self._lock:
+            self._entries[snapshot.file_hash] = (time.monotonic() + self.ttl_seconds, snapshot)
+            self._entries.move_to_end(snapshot.file_hash)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *file_hashes: str) -> None:
+        with self._lock:
+            for file_hash in file_hashes:
+                self._entries.pop(file_hash, None)
+
+
+_hash_cache: HashLookupCache | None = None
+
+
+def get_hash_cache() -> HashLookupCache:
+    global _hash_cache
+    if _hash_cache is None:
+        _hash_cache = HashLookupCache()
+    return _hash_cache
+
+
+__all__ = ["HashLookupCache", "ProofSnapshot", "get_hash_cache"]
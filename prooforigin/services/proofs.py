@@ -1,18 +1,21 @@
 """High level helpers for registering and verifying proofs."""
 from __future__ import annotations
 
-import hashlib
-import json
-import tempfile
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, BinaryIO, Iterable
 
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from prooforigin.core import models
+from prooforigin.core.database import Base, session_scope
+from prooforigin.core.hashing import sha256_file, sha256_hex
 from prooforigin.core.logging import get_logger
 from prooforigin.core.metadata import validate_metadata
 from prooforigin.core.security import (
@@ -25,6 +28,8 @@ from prooforigin.services.onchain import (
     OnChainConfigurationError,
     PolygonAnchor,
 )
+from prooforigin.services.hashcache import ProofSnapshot, get_hash_cache
+from prooforigin.services.semcache import get_semantic_cache
 from prooforigin.services.similarity import SimilarityEngine
 from prooforigin.services.storage import get_storage_service
 from prooforigin.services.timestamp import TimestampAuthority
@@ -36,10 +41,31 @@ logger = get_logger(__name__)
 
 @dataclass(slots=True)
 class ProofContent:
-    data: bytes
+    data: bytes | None
     filename: str
     mime_type: str | None
     is_binary: bool = True
+    path: Path | None = None
+    file_hash: str | None = None
+    size: int | None = None
+    spooled: bool = False
+
+    def discard(self) -> None:
+        """Remove the temporary spool file backing this content, if any."""
+        if self.spooled and self.path is not None:
+            self.path.unlink(missing_ok=True)
+            self.spooled = False
+
+    def open(self) -> BinaryIO:
+        if self.path is not None:
+            return self.path.open("rb")
+        return BytesIO(self.data or b"")
+
+    @property
+    def byte_size(self) -> int:
+        if self.size is not None:
+            return self.size
+        return len(self.data or b"")
 
 
 @dataclass(slots=True)
@@ -47,6 +73,9 @@ class ProofCreationResult:
     proof: models.Proof
     matches: list[dict[str, Any]]
     artifact: dict[str, Any]
+    reindex: bool = True
+    # Rows added alongside the proof, kept so :meth:`restore` can add them again.
+    rows: list[Base] = field(default_factory=list)
 
 
 class ProofRegistrationService:
@@ -65,8 +94,8 @@ class ProofRegistrationService:
         if not metadata_raw:
             return {}
         try:
-            return validate_metadata(json.loads(metadata_raw))
-        except json.JSONDecodeError as exc:
+            return validate_metadata(orjson.loads(metadata_raw))
+        except orjson.JSONDecodeError as exc:
             raise ValueError("Invalid metadata JSON") from exc
 
     def _assign_to_anchor_batch(self, db: Session, proof: models.Proof) -> None:
@@ -86,20 +115,26 @@ class ProofRegistrationService:
         self,
         proof: models.Proof,
         db: Session,
-        file_bytes: bytes,
-        filename: str,
-        mime_type: str | None,
-    ) -> None:
-        storage_ref = self.storage_service.store(BytesIO(file_bytes), filename=filename)
-        db.add(
-            models.ProofFile(
-                proof_id=proof.id,
-                filename=filename,
-                mime=mime_type,
-                size=len(file_bytes),
-                storage_ref=storage_ref,
-            )
+        content: ProofContent,
+    ) -> models.ProofFile:
+        if content.spooled and content.path is not None:
+            storage_ref, consumed = self.storage_service.store_file(content.path, filename=content.filename)
+            if consumed:
+                # The spool file now lives in storage; keep reading it from there.
+                content.path = Path(storage_ref)
+                content.spooled = False
+        else:
+            with content.open() as source:
+                storage_ref = self.storage_service.store(source, filename=content.filename)
+        row = models.ProofFile(
+            proof_id=proof.id,
+            filename=content.filename,
+            mime=content.mime_type,
+            size=content.byte_size,
+            storage_ref=storage_ref,
         )
+        db.add(row)
+        return row
 
     def _persist_artifact(
         self,
@@ -108,7 +143,7 @@ class ProofRegistrationService:
         metadata_payload: dict[str, Any],
         signature: str,
         db: Session,
-    ) -> dict[str, Any]:
+    ) -> tuple[dict[str, Any], models.ProofFile]:
         artifact = {
             "prooforigin_protocol": "POP-1.0",
             "proof_id": str(proof.id),
@@ -118,22 +153,21 @@ class ProofRegistrationService:
             "timestamp": proof.created_at.isoformat(),
             "metadata": metadata_payload,
         }
-        artifact_bytes = json.dumps(artifact, ensure_ascii=False, indent=2).encode("utf-8")
+        artifact_bytes = orjson.dumps(artifact, option=orjson.OPT_INDENT_2)
         artifact_ref = self.storage_service.store(artifact_bytes, filename=f"{proof.id}.proof.json")
-        db.add(
-            models.ProofFile(
-                proof_id=proof.id,
-                filename=Path(artifact_ref).name,
-                mime="application/json",
-                size=len(artifact_bytes),
-                storage_ref=artifact_ref,
-            )
+        row = models.ProofFile(
+            proof_id=proof.id,
+            filename=Path(artifact_ref).name,
+            mime="application/json",
+            size=len(artifact_bytes),
+            storage_ref=artifact_ref,
         )
-        return artifact
+        db.add(row)
+        return artifact, row
 
     def _compute_embeddings(
         self,
-        tmp_path: Path | None,
+        image: Path | BinaryIO | None,
         metadata_payload: dict[str, Any],
         text_payload: str | None,
     ) -> tuple[str | None, str | None, list[float] | None, list[float] | None, list[float] | None]:
@@ -151,19 +185,31 @@ class ProofRegistrationService:
         text_embedding = self.similarity_engine.compute_text_embedding(combined_text)
         phash = dhash = None
         perceptual_vector = clip_vector = None
-        if tmp_path and tmp_path.exists():
-            phash, dhash, perceptual_vector, clip_vector = self.similarity_engine.compute_image_hashes(tmp_path)
+        if image is not None and not (isinstance(image, Path) and not image.exists()):
+            phash, dhash, perceptual_vector, clip_vector = self.similarity_engine.compute_image_hashes(image)
         return phash, dhash, perceptual_vector, clip_vector, text_embedding
 
-    def _record_usage(self, user: models.User, proof: models.Proof, db: Session) -> None:
+    def _record_usage(self, user: models.User, proof: models.Proof, db: Session) -> models.UsageLog:
         user.credits = max(0, user.credits - 1)
-        db.add(
-            models.UsageLog(
-                user_id=user.id,
-                action="generate_proof",
-                metadata_json={"proof_id": str(proof.id)},
-            )
+        row = models.UsageLog(
+            user_id=user.id,
+            action="generate_proof",
+            metadata_json={"proof_id": str(proof.id)},
         )
+        db.add(row)
+        return row
+
+    def unlock_private_key(self, user: models.User, key_password: str) -> bytes:
+        """Decrypt ``user``'s signing key, raising ``ValueError`` on a bad password."""
+        try:
+            return decrypt_private_key(
+                user.encrypted_private_key,
+                user.private_key_nonce,
+                user.private_key_salt,
+                key_password,
+            )
+        except Exception as exc:  # pragma: no cover - defensive
+            raise ValueError("Unable to decrypt private key") from exc
 
     # ------------------------------------------------------------------
     def register_content(
@@ -174,51 +220,65 @@ class ProofRegistrationService:
         metadata_raw: str | None,
         key_password: str,
         text_payload: str | None = None,
+        defer_similarity: bool = False,
+        commit: bool = True,
+        publish: bool = True,
+        check_duplicate: bool = True,
+        private_key: bytes | None = None,
     ) -> ProofCreationResult:
+        """Sign and persist a proof for ``content``.
+
+        With ``defer_similarity`` the embedding and match computation is
+        skipped; the caller is expected to run :meth:`index_similarity` once
+        the response has been sent. With ``commit=False`` the new rows are
+        only added to the session, so several registrations can be flushed
+        together; the caller must commit, then call :meth:`publish`.
+        ``publish=False`` leaves that call to the caller after committing,
+        and ``check_duplicate=False`` is for callers that already looked the
+        hash up. Callers signing several items may pass ``private_key`` from
+        :meth:`unlock_private_key` so the key is derived only once. Every
+        ``ValueError`` is raised before anything is added.
+        """
         metadata_payload = self._parse_metadata(metadata_raw)
-        file_hash = hashlib.sha256(content.data).hexdigest()
+        file_hash = content.file_hash
+        if file_hash is None:
+            file_hash = sha256_file(content.path) if content.path is not None else sha256_hex((content.data or b"",))
 
-        if db.query(models.Proof).filter(models.Proof.file_hash == file_hash).first():
+        if check_duplicate and db.query(models.Proof).filter(models.Proof.file_hash == file_hash).first():
             raise ValueError("Proof already exists")
 
-        try:
-            private_key = decrypt_private_key(
-                user.encrypted_private_key,
-                user.private_key_nonce,
-                user.private_key_salt,
-                key_password,
-            )
-        except Exception as exc:  # pragma: no cover - defensive
-            raise ValueError("Unable to decrypt private key") from exc
+        if private_key is None:
+            private_key = self.unlock_private_key(user, key_password)
 
         signature = sign_hash(file_hash, private_key)
 
-        tmp_file: Path | None = None
-        if content.is_binary:
-            tmp_file = Path(tempfile.NamedTemporaryFile(delete=False).name)
-            tmp_file.write_bytes(content.data)
-
-        phash, dhash, perceptual_vector, clip_vector, text_embedding = self._compute_embeddings(
-            tmp_file,
-            metadata_payload,
-            text_payload,
-        )
+        phash = dhash = None
+        perceptual_vector = clip_vector = text_embedding = None
+        if not defer_similarity:
+            phash, dhash, perceptual_vector, clip_vector, text_embedding = self._compute_embeddings(
+                (content.path or BytesIO(content.data or b"")) if content.is_binary else None,
+                metadata_payload,
+                text_payload,
+            )
 
+        # Key and timestamp are assigned here rather than at flush time so the
+        # dependent rows below can be built without flushing the proof.
         proof = models.Proof(
+            id=uuid.uuid4(),
+            created_at=datetime.utcnow(),
             user_id=user.id,
             file_hash=file_hash,
             signature=signature,
             metadata_json=metadata_payload,
             file_name=content.filename,
             mime_type=content.mime_type,
-            file_size=len(content.data),
+            file_size=content.byte_size,
             phash=phash,
             dhash=dhash,
             image_embedding=clip_vector,
             text_embedding=text_embedding,
         )
         db.add(proof)
-        db.flush()
 
         if self.onchain_anchor.is_configured:
             try:
@@ -245,24 +305,57 @@ class ProofRegistrationService:
             self.timestamp_authority.prepare_anchor(db, proof, self.task_queue)
         self._assign_to_anchor_batch(db, proof)
         self.timestamp_authority.prepare_anchor(db, proof, self.task_queue)
-        self._persist_original_file(proof, db, content.data, content.filename, content.mime_type)
-        artifact = self._persist_artifact(proof, user, metadata_payload, signature, db)
-        self._record_usage(user, proof, db)
-        self.similarity_engine.persist_embeddings(db, proof, perceptual_vector)
-        matches = self.similarity_engine.update_similarity_matches(db, proof)
+        original_file = self._persist_original_file(proof, db, content)
+        artifact, artifact_file = self._persist_artifact(proof, user, metadata_payload, signature, db)
+        usage = self._record_usage(user, proof, db)
+        matches: list[dict[str, Any]] = []
+        if not defer_similarity:
+            # The vector store refresh reads embeddings back from the database.
+            db.flush()
+            self.similarity_engine.persist_embeddings(db, proof, perceptual_vector)
+            matches = self.similarity_engine.update_similarity_matches(db, proof)
+
+        result = ProofCreationResult(
+            proof=proof,
+            matches=matches,
+            artifact=artifact,
+            reindex=not defer_similarity,
+            rows=[original_file, artifact_file, usage],
+        )
+        if not commit:
+            return result
 
+        # Sessions do not expire on commit and every column default is applied
+        # client-side, so the flushed proof is already complete.
         db.commit()
-        db.refresh(proof)
-
-        if tmp_file is not None:
-            try:
-                tmp_file.unlink()
-            except FileNotFoundError:
-                pass
+        if publish:
+            self.publish(result)
+        return result
+
+    def restore(self, db: Session, user: models.User, result: ProofCreationResult) -> None:
+        """Add an uncommitted registration's rows to ``db`` again after a rollback.
+
+        The signature, stored files and any on-chain anchor from the original
+        :meth:`register_content` call are kept; only the anchor-batch
+        assignment and the credit charge, which the rollback undid, are redone.
+        """
+        db.add(result.proof)
+        for row in result.rows:
+            # A flush inside the rolled-back transaction may have assigned an id.
+            row.id = None
+            db.add(row)
+        self._assign_to_anchor_batch(db, result.proof)
+        user.credits = max(0, user.credits - 1)
 
-        self.task_queue.enqueue("prooforigin.reindex_similarity", str(proof.id))
+    def publish(self, result: ProofCreationResult) -> None:
+        """Run the post-commit side effects for a newly registered proof."""
+        proof = result.proof
+        self.similarity_engine.invalidate_embedding_matrices(proof.user_id)
+        get_semantic_cache().invalidate(proof.user_id)
+        if result.reindex:
+            self.task_queue.enqueue("prooforigin.reindex_similarity", str(proof.id))
         queue_event(
-            user.id,
+            proof.user_id,
             "proof.generated",
             {
                 "proof_id": str(proof.id),
@@ -271,7 +364,31 @@ class ProofRegistrationService:
             },
         )
 
-        return ProofCreationResult(proof=proof, matches=matches, artifact=artifact)
+    def index_similarity(
+        self,
+        proof_id: uuid.UUID,
+        image: Path | bytes | None,
+        text_payload: str | None = None,
+    ) -> None:
+        """Compute embeddings and similarity matches for a stored proof."""
+        with session_scope() as session:
+            proof = session.get(models.Proof, proof_id)
+            if proof is None:
+                logger.warning("similarity_index_missing_proof", proof_id=str(proof_id))
+                return
+            phash, dhash, perceptual_vector, clip_vector, text_embedding = self._compute_embeddings(
+                BytesIO(image) if isinstance(image, bytes) else image,
+                proof.metadata_json or {},
+                text_payload,
+            )
+            proof.phash = phash
+            proof.dhash = dhash
+            proof.image_embedding = clip_vector
+            proof.text_embedding = text_embedding
+            self.similarity_engine.persist_embeddings(session, proof, perceptual_vector)
+            self.similarity_engine.update_similarity_matches(session, proof)
+        self.similarity_engine.invalidate_embedding_matrices(proof.user_id)
+        get_semantic_cache().invalidate(proof.user_id)
 
     # ------------------------------------------------------------------
     def verify_hash(
@@ -285,12 +402,39 @@ class ProofRegistrationService:
             owner = db.get(models.User, proof.user_id)
         return proof, owner
 
+    async def verify_hash_async(
+        self,
+        db: AsyncSession,
+        file_hash: str,
+    ) -> tuple[models.Proof | None, models.User | None]:
+        proof = await db.scalar(
+            select(models.Proof).where(models.Proof.file_hash == file_hash).limit(1)
+        )
+        owner: models.User | None = None
+        if proof:
+            owner = await db.get(models.User, proof.user_id)
+        return proof, owner
+
+    async def lookup_hash_async(self, db: AsyncSession, file_hash: str) -> ProofSnapshot | None:
+        """Resolve a public hash lookup, serving repeated hits from memory."""
+        cache = get_hash_cache()
+        snapshot = cache.get(file_hash)
+        if snapshot is not None:
+            return snapshot
+        proof, owner = await self.verify_hash_async(db, file_hash)
+        if proof is None:
+            return None
+        snapshot = ProofSnapshot.from_models(proof, owner)
+        cache.put(snapshot)
+        return snapshot
+
     def build_proof_response(
         self,
         proof: models.Proof,
         matches: Iterable[dict[str, Any]],
         artifact: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
+        """Return ``ProofResponse``'s fields for ``proof``, ready for ``model_construct``."""
         return {
             "id": proof.id,
             "file_hash": proof.file_hash,
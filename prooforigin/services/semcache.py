@@ -0,0 +1,109 @@
+"""Short-lived cache of similarity searches keyed by query embeddings."""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Hashable, Sequence
+
+import numpy as np
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    scope: Hashable
+    vector: np.ndarray
+    payload: Any
+    expires_at: float
+
+
+class SemanticCache:
+    """Serve recent search results for near-identical query embeddings.
+
+    Entries are kept per user in a small LRU ring. A lookup hits when a
+    cached query with the same ``scope`` has a cosine similarity of at least
+    ``threshold`` with the incoming one and has not expired.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.97,
+        ttl_seconds: float = 300.0,
+        max_entries_per_user: int = 64,
+    ) -> None:
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries_per_user = max_entries_per_user
+        self._entries: dict[uuid.UUID, deque[_CacheEntry]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def query_vector(*embeddings: Sequence[float] | None) -> np.ndarray | None:
+        """Combine the available embeddings into one unit-length query vector."""
+        parts = []
+        for embedding in embeddings:
+            if not embedding:
+                continue
+            vector = np.asarray(embedding, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            if norm:
+                parts.append(vector / norm)
+        if not parts:
+            return None
+        combined = np.concatenate(parts)
+        return combined / np.linalg.norm(combined)
+
+    def lookup(self, user_id: uuid.UUID, scope: Hashable, vector: np.ndarray) -> Any | None:
+        now = time.monotonic()
+        with self._lock:
+            entries = self._entries.get(user_id)
+            if not entries:
+                return None
+            live = [entry for entry in entries if entry.expires_at > now]
+            if len(live) != len(entries):
+                entries.clear()
+                entries.extend(live)
+            best: _CacheEntry | None = None
+            best_score = self.threshold
+            for entry in live:
+                if entry.scope != scope or entry.vector.shape != vector.shape:
+                    continue
+                score = float(np.dot(entry.vector, vector))
+                if score >= best_score:
+                    best, best_score = entry, score
+            if best is None:
+                return None
+            # Refresh recency so frequently repeated queries survive eviction.
+            entries.remove(best)
+            entries.append(best)
+            return best.payload
+
+    def store(self, user_id: uuid.UUID, scope: Hashable, vector: np.ndarray, payload: Any) -> None:
+        entry = _CacheEntry(
+            scope=scope,
+            vector=vector,
+            payload=payload,
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        with self._lock:
+            entries = self._entries.setdefault(user_id, deque(maxlen=self.max_entries_per_user))
+            entries.append(entry)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+
+_semantic_cache: SemanticCache | None = None
+
+
+def get_semantic_cache() -> SemanticCache:
+    global _semantic_cache
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache()
+    return _semantic_cache
+
+
+__all__ = ["SemanticCache", "get_semantic_cache"]
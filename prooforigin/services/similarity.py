@@ -1,10 +1,14 @@
 """Similarity indexing and search utilities."""
 from __future__ import annotations
 
+import threading
+import time
 import uuid
+from dataclasses import dataclass
+from datetime import datetime
 from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import BinaryIO, Iterable, Optional
 
 import numpy as np
 from PIL import Image
@@ -21,9 +25,11 @@ except ImportError:  # pragma: no cover
 
 CLIPModel = SentenceTransformer  # type: ignore
 
+from sqlalchemy import LargeBinary, func, type_coerce
 from sqlalchemy.orm import Session
 
 from prooforigin.core import models
+from prooforigin.core.database import session_scope
 from prooforigin.core.logging import get_logger
 from prooforigin.core.settings import Settings, get_settings
 from prooforigin.services.vector_store import VectorStore
@@ -45,10 +51,36 @@ def _load_clip_model(model_name: str):  # pragma: no cover - heavy dependency
     return CLIPModel(model_name)
 
 
+@dataclass(slots=True)
+class _EmbeddingMatrix:
+    ids: list[uuid.UUID]
+    matrix: np.ndarray
+    stamp: tuple[int, datetime | None]
+    expires_at: float
+
+
+def _raw_vectors(column):
+    """Select an embedding column as its packed bytes, skipping the list decode."""
+    return type_coerce(column, LargeBinary)
+
+
+def _stack_vectors(blobs: list[bytes], dimension: int) -> np.ndarray:
+    """Decode packed embeddings of one ``dimension`` into a contiguous matrix."""
+    return np.frombuffer(b"".join(blobs), dtype=models.VECTOR_DTYPE).reshape(len(blobs), dimension)
+
+
+# Normalised per-user embedding matrices, shared by every engine in the process.
+_EMBEDDING_MATRICES: dict[tuple[uuid.UUID, str], _EmbeddingMatrix] = {}
+_EMBEDDING_MATRICES_LOCK = threading.Lock()
+_EMBEDDING_MATRICES_MAX = 1024
+_EMBEDDING_MATRICES_TTL = 300.0
+
+
 class SimilarityEngine:
     def __init__(self, settings: Settings | None = None) -> None:
         self.settings = settings or get_settings()
         self._vector_stores: dict[str, VectorStore] = {}
+        self._rebuild_lock = threading.Lock()
 
     # Vector store helpers -------------------------------------------------
     def _get_vector_store(self, vector_type: str, dimension: int | None = None) -> VectorStore | None:
@@ -82,35 +114,135 @@ class SimilarityEngine:
             return
         if vector_type == "phash":
             vectors = (
-                db.query(models.SimilarityIndex.proof_id, models.SimilarityIndex.vector)
+                db.query(
+                    models.SimilarityIndex.proof_id,
+                    _raw_vectors(models.SimilarityIndex.vector),
+                    models.Proof.user_id,
+                )
+                .join(models.Proof, models.Proof.id == models.SimilarityIndex.proof_id)
                 .filter(models.SimilarityIndex.vector_type == "phash")
                 .all()
             )
         else:
             vectors = (
-                db.query(models.Proof.id, vector_column)
+                db.query(models.Proof.id, _raw_vectors(vector_column), models.Proof.user_id)
                 .filter(vector_column.isnot(None))
                 .all()
             )
         if not vectors:
             return
-        dimension = len(vectors[0][1])
+        dimension = len(vectors[0][1]) // models.VECTOR_DTYPE.itemsize
+        vectors = [entry for entry in vectors if len(entry[1]) == dimension * models.VECTOR_DTYPE.itemsize]
         store = self._get_vector_store(vector_type, dimension)
         if store is None:
             return
         store.reset()
         store.add_vectors(
             [str(entry[0]) for entry in vectors],
-            [entry[1] for entry in vectors],
+            _stack_vectors([entry[1] for entry in vectors], dimension),
+            owners=[str(entry[2]) for entry in vectors],
         )
 
+    def _ready_vector_store(self, vector_type: str) -> VectorStore | None:
+        """Return the store for ``vector_type``, rebuilding it first if its owner map is missing."""
+        store = self._get_vector_store(vector_type)
+        if store is None or not store.needs_rebuild:
+            return store
+        with self._rebuild_lock:
+            if store.needs_rebuild:
+                logger.info("faiss_index_rebuild", vector_type=vector_type)
+                with session_scope() as session:
+                    self._refresh_vector_store(session, vector_type)
+                if store.needs_rebuild:
+                    # Nothing left in the database to index.
+                    store.reset()
+        return store
+
+    # Per-user embedding matrices ---------------------------------------
+    def _embedding_matrix(self, db: Session, user_id: uuid.UUID, vector_type: str) -> _EmbeddingMatrix | None:
+        key = (user_id, vector_type)
+        column = models.Proof.image_embedding if vector_type == "clip" else models.Proof.text_embedding
+        # The stamp comes from committed rows, so embeddings written by another
+        # process (or committed after a rebuild raced with them) are noticed.
+        count, latest = (
+            db.query(func.count(models.Proof.id), func.max(models.Proof.created_at))
+            .filter(models.Proof.user_id == user_id, column.isnot(None))
+            .one()
+        )
+        stamp = (count, latest)
+        with _EMBEDDING_MATRICES_LOCK:
+            cached = _EMBEDDING_MATRICES.get(key)
+        if cached is not None and cached.stamp == stamp and cached.expires_at > time.monotonic():
+            return cached
+        if not count:
+            return None
+        rows = [
+            (proof_id, vector)
+            for proof_id, vector in db.query(models.Proof.id, _raw_vectors(column)).filter(
+                models.Proof.user_id == user_id, column.isnot(None)
+            )
+            if vector
+        ]
+        if not rows:
+            return None
+        size = len(rows[0][1])
+        rows = [row for row in rows if len(row[1]) == size]
+        matrix = _stack_vectors([vector for _, vector in rows], size // models.VECTOR_DTYPE.itemsize)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        entry = _EmbeddingMatrix(
+            ids=[proof_id for proof_id, _ in rows],
+            matrix=matrix / norms,
+            stamp=stamp,
+            expires_at=time.monotonic() + _EMBEDDING_MATRICES_TTL,
+        )
+        with _EMBEDDING_MATRICES_LOCK:
+            _EMBEDDING_MATRICES.pop(key, None)
+            if len(_EMBEDDING_MATRICES) >= _EMBEDDING_MATRICES_MAX:
+                _EMBEDDING_MATRICES.pop(next(iter(_EMBEDDING_MATRICES)))
+            _EMBEDDING_MATRICES[key] = entry
+        return entry
+
+    def invalidate_embedding_matrices(self, user_id: uuid.UUID) -> None:
+        """Drop ``user_id``'s cached matrices; call once new embeddings are committed."""
+        with _EMBEDDING_MATRICES_LOCK:
+            for vector_type in ("clip", "text"):
+                _EMBEDDING_MATRICES.pop((user_id, vector_type), None)
+
+    def rank_user_candidates(
+        self,
+        db: Session,
+        user_id: uuid.UUID,
+        vector_type: str,
+        query_vector: list[float] | None,
+        top_k: int,
+    ) -> list[uuid.UUID]:
+        """Return the ids of the user's proofs closest to ``query_vector``."""
+        if not query_vector:
+            return []
+        entry = self._embedding_matrix(db, user_id, vector_type)
+        if entry is None:
+            return []
+        query = np.asarray(query_vector, dtype=np.float32)
+        if query.shape[0] != entry.matrix.shape[1]:
+            return []
+        norm = np.linalg.norm(query)
+        if not norm:
+            return []
+        scores = entry.matrix @ (query / norm)
+        if top_k < len(scores):
+            top = np.argpartition(-scores, top_k)[:top_k]
+        else:
+            top = np.arange(len(scores))
+        return [entry.ids[index] for index in top]
+
     def compute_image_hashes(
-        self, file_path: Path
+        self, source: str | Path | BinaryIO
     ) -> tuple[str | None, str | None, list[float] | None, list[float] | None]:
         if imagehash is None:
             return None, None, None, None
         try:
-            with Image.open(file_path) as img:
+            with Image.open(source) as img:
                 img = img.convert("RGB")
                 phash = imagehash.phash(img)
                 dhash = imagehash.dhash(img)
@@ -309,13 +441,16 @@ class SimilarityEngine:
         vector_type: str,
         query_vector: list[float] | None,
         top_k: int = 5,
+        user_id: uuid.UUID | None = None,
     ) -> list[str]:
+        """Return the nearest proof ids, restricted to ``user_id``'s proofs when given."""
         if not query_vector:
             return []
-        store = self._vector_stores.get(vector_type)
+        store = self._ready_vector_store(vector_type)
         if not store:
             return []
-        return [item[0] for item in store.query(query_vector, top_k=top_k)]
+        owner = str(user_id) if user_id is not None else None
+        return [item[0] for item in store.query(query_vector, top_k=top_k, owner=owner)]
 
 
 __all__ = ["SimilarityEngine"]
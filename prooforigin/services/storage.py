@@ -1,6 +1,9 @@
 """Storage abstraction for proof assets."""
 from __future__ import annotations
 
+import errno
+import os
+import shutil
 import uuid
 from pathlib import Path
 from typing import BinaryIO
@@ -10,6 +13,7 @@ from prooforigin.core.settings import get_settings
 
 try:  # Optional dependency
     import boto3
+    from botocore.config import Config as BotoConfig
     from botocore.exceptions import ClientError
 except Exception:  # pragma: no cover - boto not installed
     boto3 = None  # type: ignore
@@ -17,6 +21,9 @@ except Exception:  # pragma: no cover - boto not installed
 
 logger = get_logger(__name__)
 
+# Matches the default AnyIO threadpool that runs sync routes.
+_S3_POOL_CONNECTIONS = 40
+
 
 class StorageError(RuntimeError):
     """Raised when a storage operation fails."""
@@ -28,6 +35,8 @@ class StorageService:
     def __init__(self) -> None:
         self.settings = get_settings()
         self._client = None
+        # Local directories already created, so each write skips the mkdir.
+        self._known_dirs: set[Path] = set()
         if self.settings.storage_backend == "s3":
             if boto3 is None:
                 raise StorageError("boto3 is required for S3 storage backend")
@@ -38,21 +47,33 @@ class StorageService:
                 aws_secret_access_key=self.settings.storage_s3_secret_key,
                 region_name=self.settings.storage_s3_region,
             )
+            # One client serves every request thread; size its connection
+            # pool for the threadpool so uploads reuse TLS sessions.
             self._client = session.client(
                 "s3",
                 endpoint_url=self.settings.storage_s3_endpoint,
+                config=BotoConfig(
+                    max_pool_connections=_S3_POOL_CONNECTIONS,
+                    retries={"mode": "standard"},
+                    tcp_keepalive=True,
+                ),
             )
 
     def _generate_key(self, filename: str | None = None) -> str:
         suffix = Path(filename).suffix if filename else ""
         return f"proofs/{uuid.uuid4().hex}{suffix}"
 
+    def _ensure_dir(self, path: Path) -> None:
+        if path not in self._known_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(path)
+
     def store(self, data: bytes | BinaryIO, filename: str | None = None) -> str:
         """Persist the provided bytes in the configured backend."""
         key = self._generate_key(filename)
         if self.settings.storage_backend == "local":
             target = self.settings.resolved_storage_path / key
-            target.parent.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(target.parent)
             if isinstance(data, bytes):
                 target.write_bytes(data)
             else:
@@ -72,6 +93,62 @@ class StorageService:
             raise StorageError("Failed to upload object to S3") from exc
         return key
 
+    def store_file(self, path: Path, filename: str | None = None) -> tuple[str, bool]:
+        """Persist a file from disk, returning ``(storage_ref, consumed)``.
+
+        On the local backend the file is moved into place and ``consumed`` is
+        true; otherwise it is streamed to the backend and left for the caller.
+        """
+        key = self._generate_key(filename)
+        if self.settings.storage_backend == "local":
+            target = self.settings.resolved_storage_path / key
+            self._ensure_dir(target.parent)
+            _relocate(path, target)
+            return str(target), True
+
+        assert self._client is not None
+        try:
+            self._client.upload_file(str(path), self.settings.storage_s3_bucket, key)
+        except ClientError as exc:  # pragma: no cover - network
+            logger.error("s3_upload_failed", error=str(exc), key=key)
+            raise StorageError("Failed to upload object to S3") from exc
+        return key, False
+
+    def put(self, key: str, data: bytes) -> str:
+        """Write ``data`` under a caller-chosen ``key``, replacing any previous object."""
+        if self.settings.storage_backend == "local":
+            target = self.settings.resolved_storage_path / key
+            self._ensure_dir(target.parent)
+            target.write_bytes(data)
+            return str(target)
+
+        assert self._client is not None
+        try:
+            self._client.put_object(Bucket=self.settings.storage_s3_bucket, Key=key, Body=data)
+        except ClientError as exc:  # pragma: no cover - network
+            logger.error("s3_upload_failed", error=str(exc), key=key)
+            raise StorageError("Failed to upload object to S3") from exc
+        return key
+
+    def fetch(self, key: str) -> bytes | None:
+        """Return the object stored under ``key``, or ``None`` when it is absent."""
+        if self.settings.storage_backend == "local":
+            target = self.settings.resolved_storage_path / key
+            try:
+                return target.read_bytes()
+            except FileNotFoundError:
+                return None
+
+        assert self._client is not None
+        try:
+            response = self._client.get_object(Bucket=self.settings.storage_s3_bucket, Key=key)
+        except ClientError as exc:  # pragma: no cover - network
+            if exc.response.get("Error", {}).get("Code") in {"NoSuchKey", "404"}:
+                return None
+            logger.error("s3_download_failed", error=str(exc), key=key)
+            raise StorageError("Failed to download object from S3") from exc
+        return response["Body"].read()
+
     def get_download_url(self, storage_ref: str) -> str:
         if self.settings.storage_backend == "local":
             return Path(storage_ref).as_uri()
@@ -91,6 +168,17 @@ class StorageService:
         return url
 
 
+def _relocate(source: Path, target: Path) -> None:
+    try:
+        os.replace(source, target)
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+        # Different filesystems: copyfile uses sendfile() on Linux, keeping the copy in the kernel.
+        shutil.copyfile(source, target)
+        source.unlink()
+
+
 _storage_service: StorageService | None = None
 
 
@@ -27,6 +27,13 @@ class VectorStore:
         self._lock = threading.Lock()
         self._index = None
         self._id_map: list[str] = []
+        # Owner of each indexed vector, so searches can be restricted to one
+        # user's proofs inside FAISS instead of filtering the hits afterwards.
+        self._owners: list[str] = []
+        self._owner_positions: dict[str, list[int]] = {}
+        # Set when the persisted index has no usable owner map; owner-filtered
+        # queries cannot be answered until the index is rebuilt.
+        self.needs_rebuild = False
         if faiss is not None:
             self._load()
         else:
@@ -54,13 +61,30 @@ class VectorStore:
                 id_map_path = self.index_path.with_suffix(".ids")
                 if id_map_path.exists():
                     self._id_map = id_map_path.read_text().splitlines()
+                owners_path = self.index_path.with_suffix(".owners")
+                owners = owners_path.read_text().splitlines() if owners_path.exists() else []
+                if len(owners) == len(self._id_map):
+                    self._owners = owners
+                    self._index_owners(0)
+                else:
+                    # Written before owners were tracked: the owner of each
+                    # vector is unknown, so the index must be rebuilt.
+                    self.needs_rebuild = True
+                    logger.warning("faiss_index_owners_missing", path=str(self.index_path))
                 logger.info("faiss_index_loaded", entries=len(self._id_map))
             except Exception as exc:  # pragma: no cover - disk errors
                 logger.warning("faiss_index_failed", error=str(exc))
                 self.index_path.unlink(missing_ok=True)
                 self.index_path.with_suffix(".ids").unlink(missing_ok=True)
+                self.index_path.with_suffix(".owners").unlink(missing_ok=True)
                 self._index = None
                 self._id_map = []
+                self._owners = []
+                self._owner_positions = {}
+
+    def _index_owners(self, start: int) -> None:
+        for position in range(start, len(self._owners)):
+            self._owner_positions.setdefault(self._owners[position], []).append(position)
 
     # Public API -------------------------------------------------------
     def is_available(self) -> bool:
@@ -74,13 +98,25 @@ class VectorStore:
             if self._index is not None:
                 self._index.reset()  # type: ignore[attr-defined]
             self._id_map = []
+            self._owners = []
+            self._owner_positions = {}
+            self.needs_rebuild = False
             self.index_path.unlink(missing_ok=True)
             self.index_path.with_suffix(".ids").unlink(missing_ok=True)
-
-    def add_vectors(self, ids: Sequence[str], vectors: Iterable[Sequence[float]]) -> None:
+            self.index_path.with_suffix(".owners").unlink(missing_ok=True)
+
+    def add_vectors(
+        self,
+        ids: Sequence[str],
+        vectors: Iterable[Sequence[float]],
+        owners: Sequence[str] | None = None,
+    ) -> None:
         if faiss is None:
             return
-        vectors_array = np.array(list(vectors), dtype="float32")
+        if isinstance(vectors, np.ndarray):
+            vectors_array = np.asarray(vectors, dtype="float32")
+        else:
+            vectors_array = np.array(list(vectors), dtype="float32")
         if vectors_array.size == 0:
             return
         if vectors_array.ndim == 1:
@@ -93,9 +129,18 @@ class VectorStore:
                 vectors_array = vectors_array / norms
             self._index.add(vectors_array)  # type: ignore[attr-defined]
             self._id_map.extend(ids)
+            start = len(self._owners)
+            self._owners.extend(owners if owners is not None else [""] * len(ids))
+            self._index_owners(start)
             self._persist()
 
-    def query(self, vector: Sequence[float], top_k: int = 5) -> list[tuple[str, float]]:
+    def query(
+        self,
+        vector: Sequence[float],
+        top_k: int = 5,
+        owner: str | None = None,
+    ) -> list[tuple[str, float]]:
+        """Return the ``top_k`` nearest ids, optionally among ``owner``'s vectors only."""
         if faiss is None:
             return []
         vec = np.array(vector, dtype="float32")
@@ -108,7 +153,20 @@ class VectorStore:
         with self._lock:
             if self._index is None or self._index.ntotal == 0:  # type: ignore[attr-defined]
                 return []
-            distances, indices = self._index.search(vec, top_k)  # type: ignore[attr-defined]
+            if owner is not None and self.needs_rebuild:
+                return []
+            if owner is None:
+                distances, indices = self._index.search(vec, top_k)  # type: ignore[attr-defined]
+            else:
+                positions = self._owner_positions.get(owner)
+                if not positions:
+                    return []
+                selector = faiss.IDSelectorBatch(np.asarray(positions, dtype="int64"))  # type: ignore[attr-defined]
+                distances, indices = self._index.search(  # type: ignore[attr-defined]
+                    vec,
+                    min(top_k, len(positions)),
+                    params=faiss.SearchParameters(sel=selector),  # type: ignore[attr-defined]
+                )
         results: list[tuple[str, float]] = []
         for idx, distance in zip(indices[0], distances[0]):
             if idx == -1 or idx >= len(self._id_map):
@@ -127,6 +185,7 @@ class VectorStore:
             faiss.write_index(self._index, str(self.index_path))  # type: ignore[attr-defined]
             id_map_path = self.index_path.with_suffix(".ids")
             id_map_path.write_text("\n".join(self._id_map))
+            self.index_path.with_suffix(".owners").write_text("\n".join(self._owners))
         except Exception as exc:  # pragma: no cover
             logger.warning("faiss_persist_failed", error=str(exc))
 
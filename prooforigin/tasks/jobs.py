@@ -36,6 +36,47 @@ def reindex_similarity_job(proof_id: str) -> None:
         session.commit()
 
 
+@register_task("prooforigin.batch_verify")
+def batch_verify_job(job_id: str, proof_ids: list[str]) -> None:
+    from datetime import datetime
+
+    from prooforigin.core.database import session_scope
+    from prooforigin.core import models
+    from prooforigin.core.security import verify_batch
+    from prooforigin.services.webhooks import queue_event
+
+    with session_scope() as session:
+        job = session.get(models.BatchJob, uuid.UUID(job_id))
+        if not job:
+            logger.warning("batch_verify_missing_job", job_id=job_id)
+            return
+        rows = (
+            session.query(models.Proof, models.User.public_key)
+            .join(models.User, models.User.id == models.Proof.user_id)
+            .filter(models.Proof.id.in_([uuid.UUID(pid) for pid in proof_ids]))
+            .filter(models.Proof.user_id == job.user_id)
+            .all()
+        )
+        outcomes = verify_batch(
+            (proof.file_hash, proof.signature, public_key) for proof, public_key in rows
+        )
+        results: dict[str, bool] = {}
+        for (proof, _), valid in zip(rows, outcomes):
+            results[str(proof.id)] = valid
+            session.add(models.Verification(proof_id=proof.id, hash=proof.file_hash, success=valid))
+        job.processed_items = len(rows)
+        job.status = "completed"
+        job.completed_at = datetime.utcnow()
+        job.result_payload = {
+            "results": results,
+            "missing": [pid for pid in proof_ids if pid not in results],
+        }
+        user_id = job.user_id
+        payload = {"job_id": job_id, **job.result_payload}
+
+    queue_event(user_id, "batch.verify_completed", payload)
+
+
 @register_task("prooforigin.process_webhooks")
 def process_webhooks_job() -> None:
     from prooforigin.services.webhooks import process_delivery_queue
@@ -52,7 +93,9 @@ def send_email_job(message: dict[str, Any]) -> None:
 
 @register_task("prooforigin.verify_storage")
 def verify_storage_job() -> None:
-    from pathlib import Path
+    import os
+
+    from sqlalchemy import select
 
     from prooforigin.core.database import session_scope
     from prooforigin.core import models
@@ -61,16 +104,15 @@ def verify_storage_job() -> None:
     settings = get_settings()
     if settings.storage_backend != "local":
         return
-    missing: list[str] = []
     with session_scope() as session:
-        proofs = session.query(models.Proof).all()
-        for proof in proofs:
-            for file in proof.files:
-                if not file.storage_ref:
-                    continue
-                path = Path(file.storage_ref)
-                if not path.exists():
-                    missing.append(file.storage_ref)
+        # Only the stored paths are needed: one column query instead of
+        # loading every proof and then its files one proof at a time.
+        refs = session.scalars(
+            select(models.ProofFile.storage_ref).where(
+                models.ProofFile.storage_ref.isnot(None), models.ProofFile.storage_ref != ""
+            )
+        ).all()
+    missing = [ref for ref in refs if not os.path.exists(ref)]
     if missing:
         logger.warning("storage_integrity_missing", files=missing)
     else:
@@ -80,6 +122,7 @@ def verify_storage_job() -> None:
 __all__ = [
     "anchor_proof_job",
     "reindex_similarity_job",
+    "batch_verify_job",
     "process_webhooks_job",
     "send_email_job",
     "verify_storage_job",
@@ -7,7 +7,7 @@ from pathlib import Path
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from prooforigin.api.dependencies.database import get_db
 from prooforigin.core import models
@@ -38,7 +38,13 @@ def dashboard(
     request: Request,
     db: Session = Depends(get_db),
 ) -> HTMLResponse:
-    proofs = db.query(models.Proof).order_by(models.Proof.created_at.desc()).limit(25).all()
+    proofs = (
+        db.query(models.Proof)
+        .options(selectinload(models.Proof.matches))
+        .order_by(models.Proof.created_at.desc())
+        .limit(25)
+        .all()
+    )
     context = _base_context(request)
     context.update(
         {
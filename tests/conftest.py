@@ -0,0 +1,52 @@
+import os
+import tempfile
+import uuid
+
+import pytest
+
+# Settings are read once per process, so the throwaway data directory and the
+# cheap Argon2 parameters must be in place before prooforigin is imported.
+_DATA_DIR = tempfile.mkdtemp(prefix="prooforigin-tests-")
+os.environ.setdefault("PROOFORIGIN_DATA_DIR", _DATA_DIR)
+os.environ.setdefault("PROOFORIGIN_STORAGE_LOCAL_PATH", os.path.join(_DATA_DIR, "uploads"))
+os.environ.setdefault("PROOFORIGIN_FAISS_INDEX_PATH", os.path.join(_DATA_DIR, "faiss.index"))
+os.environ.setdefault("PROOFORIGIN_PASSWORD_TIME_COST", "1")
+os.environ.setdefault("PROOFORIGIN_PASSWORD_MEMORY_COST", "1024")
+
+KEY_PASSWORD = "correct horse battery staple"
+
+
+@pytest.fixture()
+def db_session():
+    from prooforigin.core.database import get_sessionmaker, init_database
+
+    init_database()
+    session = get_sessionmaker()()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def make_user(db_session):
+    from prooforigin.core import models
+    from prooforigin.core.security import encrypt_private_key, generate_ed25519_keypair, hash_password
+
+    def factory() -> models.User:
+        private_key, public_key = generate_ed25519_keypair()
+        ciphertext, nonce, salt = encrypt_private_key(private_key, KEY_PASSWORD)
+        user = models.User(
+            email=f"{uuid.uuid4().hex}@example.com",
+            password_hash=hash_password(KEY_PASSWORD),
+            public_key=public_key,
+            encrypted_private_key=ciphertext,
+            private_key_nonce=nonce,
+            private_key_salt=salt,
+            credits=100,
+        )
+        db_session.add(user)
+        db_session.commit()
+        return user
+
+    return factory
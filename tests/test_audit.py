@@ -0,0 +1,94 @@
+import uuid
+from contextlib import contextmanager
+
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from prooforigin.core import models
+from prooforigin.services import audit
+from prooforigin.services.audit import AuditWriter
+
+
+def _verification_rows(db_session, file_hash):
+    return db_session.scalars(select(models.Verification).where(models.Verification.hash == file_hash)).all()
+
+
+def test_audit_writer_close_flushes_pending_rows(db_session):
+    writer = AuditWriter(flush_interval=60)
+    file_hash = uuid.uuid4().hex
+    writer.verification(file_hash, None, False, "127.0.0.1")
+    assert _verification_rows(db_session, file_hash) == []
+
+    writer.close()
+
+    rows = _verification_rows(db_session, file_hash)
+    assert len(rows) == 1
+    assert rows[0].success is False
+    assert rows[0].requester_ip == "127.0.0.1"
+
+
+def test_audit_writer_flush_writes_one_row_per_enqueue(db_session):
+    writer = AuditWriter(flush_interval=60)
+    file_hash = uuid.uuid4().hex
+    for _ in range(3):
+        writer.verification(file_hash, None, True, None)
+
+    writer.flush()
+
+    assert len(_verification_rows(db_session, file_hash)) == 3
+    writer.close()
+
+
+def test_audit_writer_requeues_rows_when_flush_fails(db_session, monkeypatch):
+    @contextmanager
+    def unavailable_scope():
+        raise OperationalError("INSERT", {}, Exception("database unavailable"))
+        yield  # pragma: no cover
+
+    writer = AuditWriter(flush_interval=60)
+    file_hash = uuid.uuid4().hex
+    writer.verification(file_hash, None, True, None)
+    monkeypatch.setattr(audit, "session_scope", unavailable_scope)
+
+    writer.flush()
+
+    assert _verification_rows(db_session, file_hash) == []
+    monkeypatch.undo()
+    writer.close()
+    assert len(_verification_rows(db_session, file_hash)) == 1
+
+
+def test_audit_writer_caps_requeued_rows(monkeypatch):
+    @contextmanager
+    def unavailable_scope():
+        raise OperationalError("INSERT", {}, Exception("database unavailable"))
+        yield  # pragma: no cover
+
+    writer = AuditWriter(flush_interval=60, max_pending=2)
+    monkeypatch.setattr(audit, "session_scope", unavailable_scope)
+    hashes = [uuid.uuid4().hex for _ in range(3)]
+    for file_hash in hashes:
+        writer.verification(file_hash, None, True, None)
+
+    writer.flush()
+
+    # The oldest row is dropped once the cap is exceeded.
+    assert [values["hash"] for _, values in writer._pending] == hashes[1:]
+    writer._pending.clear()
+    writer.close()
+
+
+def test_audit_writer_drops_rejected_rows_without_blocking_the_rest(db_session):
+    writer = AuditWriter(flush_interval=60)
+    first, second = uuid.uuid4().hex, uuid.uuid4().hex
+    writer.verification(first, None, True, None)
+    # verifications.hash is NOT NULL, so this row fails the bulk insert.
+    writer.verification(None, None, True, None)
+    writer.verification(second, None, True, None)
+
+    writer.flush()
+
+    assert len(_verification_rows(db_session, first)) == 1
+    assert len(_verification_rows(db_session, second)) == 1
+    assert not writer._pending
+    writer.close()
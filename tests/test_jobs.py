@@ -0,0 +1,25 @@
+import uuid
+from datetime import datetime
+
+from prooforigin.core import models
+from prooforigin.tasks.jobs import batch_verify_job
+
+
+def test_batch_verify_reports_other_users_proofs_as_missing(db_session, make_user):
+    owner, stranger = make_user(), make_user()
+    foreign = models.Proof(
+        id=uuid.uuid4(),
+        user_id=stranger.id,
+        file_hash=uuid.uuid4().hex,
+        signature="sig",
+        created_at=datetime.utcnow(),
+    )
+    job = models.BatchJob(user_id=owner.id, total_items=1, processed_items=0)
+    db_session.add_all([foreign, job])
+    db_session.commit()
+
+    batch_verify_job(str(job.id), [str(foreign.id)])
+
+    db_session.refresh(job)
+    assert job.result_payload == {"results": {}, "missing": [str(foreign.id)]}
+    assert job.processed_items == 0
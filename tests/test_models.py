@@ -0,0 +1,15 @@
+import numpy as np
+
+from prooforigin.core import models
+
+
+def test_packed_vector_round_trip():
+    column_type = models.PackedVector()
+    values = [0.5, -1.25, 3.0]
+
+    packed = column_type.process_bind_param(values, None)
+
+    assert packed == np.asarray(values, dtype="<f4").tobytes()
+    assert column_type.process_result_value(packed, None) == values
+    assert column_type.process_bind_param(None, None) is None
+    assert column_type.process_result_value(None, None) is None
@@ -0,0 +1,126 @@
+import hashlib
+import uuid
+from datetime import datetime
+from secrets import token_hex
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from prooforigin.api.main import create_app
+from prooforigin.api.routers import public_api
+from prooforigin.api.routers.proofs import list_user_proofs
+from prooforigin.core import models
+
+from conftest import KEY_PASSWORD
+
+
+def _api_key(db_session, user, quota=100):
+    api_key = models.ApiKey(user_id=user.id, key=token_hex(16), quota=quota)
+    db_session.add(api_key)
+    db_session.commit()
+    return api_key.key
+
+
+def _batch(client, key, *texts):
+    response = client.post(
+        "/api/v1/batch",
+        json={"items": [{"text": text} for text in texts], "key_password": KEY_PASSWORD},
+        headers={"X-API-Key": key},
+    )
+    assert response.status_code == 200
+    return response.json()["results"]
+
+
+def test_batch_register_reports_duplicates(db_session, make_user):
+    user = make_user()
+    key = _api_key(db_session, user)
+    client = TestClient(create_app())
+    registered = f"already registered {uuid.uuid4()}"
+    fresh = f"fresh {uuid.uuid4()}"
+    assert _batch(client, key, registered)[0]["success"]
+
+    results = _batch(client, key, fresh, fresh, registered)
+
+    assert [result["success"] for result in results] == [True, False, False]
+    assert results[1]["error"] == results[2]["error"] == "Proof already exists"
+    assert results[0]["proof"]["file_hash"] == hashlib.sha256(fresh.encode()).hexdigest()
+
+
+def test_batch_register_survives_a_concurrent_duplicate(db_session, make_user, monkeypatch):
+    user = make_user()
+    key = _api_key(db_session, user)
+    client = TestClient(create_app())
+    racing = f"racing {uuid.uuid4()}"
+    fresh = f"fresh {uuid.uuid4()}"
+    unlock = public_api.registration_service.unlock_private_key
+
+    def unlock_after_race(owner, password):
+        # Another request commits one of the hashes after the duplicate lookup.
+        db_session.add(
+            models.Proof(
+                user_id=user.id,
+                file_hash=hashlib.sha256(racing.encode()).hexdigest(),
+                signature="sig",
+                created_at=datetime.utcnow(),
+            )
+        )
+        db_session.commit()
+        return unlock(owner, password)
+
+    monkeypatch.setattr(public_api.registration_service, "unlock_private_key", unlock_after_race)
+    register = public_api.registration_service.register_content
+    registered = []
+
+    def counting_register(db, owner, content, *args, **kwargs):
+        registered.append(content.file_hash)
+        return register(db, owner, content, *args, **kwargs)
+
+    monkeypatch.setattr(public_api.registration_service, "register_content", counting_register)
+
+    results = _batch(client, key, fresh, racing)
+
+    assert results[0]["success"]
+    assert results[1] == {"success": False, "proof": None, "error": "Proof already exists"}
+    # The retry re-adds the first pass's rows rather than signing and storing again.
+    assert len(registered) == 2
+    # Only the item that was actually registered is charged.
+    assert db_session.scalar(select(models.ApiKey.quota).where(models.ApiKey.key == key)) == 99
+
+
+def test_list_user_proofs_cursor_covers_tied_timestamps(db_session, make_user):
+    user = make_user()
+    stamp = datetime.utcnow().replace(microsecond=0)
+    proofs = [
+        models.Proof(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            file_hash=uuid.uuid4().hex,
+            signature="sig",
+            created_at=stamp,
+        )
+        for _ in range(5)
+    ]
+    db_session.add_all(proofs)
+    db_session.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        page = list_user_proofs(page=1, page_size=2, anchored=None, cursor=cursor, current_user=user, db=db_session)
+        assert page.total == 5
+        seen.extend(item.id for item in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert len(seen) == 5
+    assert set(seen) == {proof.id for proof in proofs}
+
+
+def test_list_user_proofs_rejects_malformed_cursor(db_session, make_user):
+    user = make_user()
+    with pytest.raises(HTTPException) as excinfo:
+        list_user_proofs(page=1, page_size=2, anchored=None, cursor="not-a-cursor", current_user=user, db=db_session)
+    assert excinfo.value.status_code == 400
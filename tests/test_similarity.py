@@ -0,0 +1,79 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+from prooforigin.core import models
+from prooforigin.services.semcache import SemanticCache
+from prooforigin.services.similarity import SimilarityEngine
+
+
+def _proof(user, **values):
+    return models.Proof(
+        id=uuid.uuid4(),
+        user_id=user.id,
+        file_hash=uuid.uuid4().hex,
+        signature="sig",
+        created_at=datetime.utcnow(),
+        **values,
+    )
+
+
+def test_embedding_matrix_picks_up_newly_committed_proofs(db_session, make_user):
+    user = make_user()
+    engine = SimilarityEngine()
+    first = _proof(user, text_embedding=[1.0, 0.0, 0.0])
+    db_session.add(first)
+    db_session.commit()
+    assert engine.rank_user_candidates(db_session, user.id, "text", [1.0, 0.0, 0.0], 5) == [first.id]
+
+    second = _proof(user, text_embedding=[0.0, 1.0, 0.0])
+    db_session.add(second)
+    db_session.commit()
+
+    # No explicit invalidation: the cached matrix is stale and gets rebuilt.
+    ranked = engine.rank_user_candidates(db_session, user.id, "text", [0.0, 1.0, 0.0], 5)
+    assert set(ranked) == {first.id, second.id}
+
+
+def test_embedding_matrix_invalidation_is_per_user(db_session, make_user):
+    owner, other = make_user(), make_user()
+    engine = SimilarityEngine()
+    db_session.add_all([_proof(owner, text_embedding=[1.0, 0.0]), _proof(other, text_embedding=[1.0, 0.0])])
+    db_session.commit()
+
+    engine.invalidate_embedding_matrices(owner.id)
+
+    assert len(engine.rank_user_candidates(db_session, owner.id, "text", [1.0, 0.0], 5)) == 1
+    assert len(engine.rank_user_candidates(db_session, other.id, "text", [1.0, 0.0], 5)) == 1
+
+
+def test_semantic_cache_scope_separates_perceptual_hashes():
+    cache = SemanticCache()
+    user_id = uuid.uuid4()
+    vector = SemanticCache.query_vector([1.0, 0.0, 0.0])
+    cache.store(user_id, (5, True, False, "aaaa", "bbbb"), vector, ["cached"])
+
+    assert cache.lookup(user_id, (5, True, False, "aaaa", "bbbb"), vector) == ["cached"]
+    assert cache.lookup(user_id, (5, True, False, "cccc", "bbbb"), vector) is None
+
+    cache.invalidate(user_id)
+    assert cache.lookup(user_id, (5, True, False, "aaaa", "bbbb"), vector) is None
+
+
+def test_vector_store_without_owner_map_needs_rebuild(tmp_path):
+    pytest.importorskip("faiss")
+    from prooforigin.services.vector_store import VectorStore
+
+    index_path = tmp_path / "legacy.index"
+    store = VectorStore(index_path, dimension=2)
+    store.add_vectors(["a", "b"], [[1.0, 0.0], [0.0, 1.0]], owners=["alice", "bob"])
+    assert [proof_id for proof_id, _ in store.query([1.0, 0.0], top_k=2, owner="alice")] == ["a"]
+
+    index_path.with_suffix(".owners").unlink()
+    legacy = VectorStore(index_path, dimension=2)
+
+    assert legacy.needs_rebuild
+    assert legacy.query([1.0, 0.0], top_k=2, owner="alice") == []
+    legacy.reset()
+    assert not legacy.needs_rebuild